@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import timeit
+from collections.abc import Callable
+from datetime import date
+from typing import Any
+
+from codicefiscale import codicefiscale
+
+NUMBER: int = 10000
+
+
+def _benchmark(name: str, func: Callable[[], Any], number: int = NUMBER) -> float:
+    seconds = min(timeit.repeat(func, number=number, repeat=5))
+    usec_per_call = seconds / number * 1_000_000
+    print(f"{name:<60} {usec_per_call:>10.2f} usec/call")
+    return usec_per_call
+
+
+def _print_speedup(usec_reference: float, usec: float) -> None:
+    if usec <= usec_reference:
+        print(f"{'':<60} {usec_reference / usec:>10.2f}x faster")
+    else:
+        print(f"{'':<60} {usec / usec_reference:>10.2f}x slower")
+
+
+def _benchmark_compare(
+    name: str,
+    func: Callable[[], Any],
+    reference_name: str,
+    func_reference: Callable[[], Any],
+    number: int = NUMBER,
+) -> None:
+    # the reference is a slower input / path of the current implementation,
+    # not the implementation before the optimization
+    usec_reference = _benchmark(reference_name, func_reference, number)
+    usec = _benchmark(name, func, number)
+    _print_speedup(usec_reference, usec)
+
+
+def benchmark_decode_raw() -> None:
+    # messy input is normalized using the slug translation table,
+    # canonical input uses the fast path
+    _benchmark_compare(
+        "decode_raw - canonical input",
+        lambda: codicefiscale.decode_raw("CCCFBA85D03L219P"),
+        "decode_raw - messy input",
+        lambda: codicefiscale.decode_raw("CCC-FBA-85-D03-L219-P"),
+    )
+    _benchmark_compare(
+        "decode_raw - canonical bytes input",
+        lambda: codicefiscale.decode_raw(b"CCCFBA85D03L219P"),
+        "decode_raw - messy bytes input",
+        lambda: codicefiscale.decode_raw(b"CCC-FBA-85-D03-L219-P"),
+    )
+
+
+def benchmark_encode_cin() -> None:
+    _benchmark("encode_cin", lambda: codicefiscale.encode_cin("CCCFBA85D03L219"))
+    _benchmark(
+        "encode_cin - bytes input",
+        lambda: codicefiscale.encode_cin(b"CCCFBA85D03L219"),
+    )
+
+
+def benchmark_is_valid() -> None:
+    _benchmark_compare(
+        "is_valid - canonical input - level 'checksum'",
+        lambda: codicefiscale.is_valid("CCCFBA85D03L219P", level="checksum"),
+        "is_valid - messy input - level 'checksum'",
+        lambda: codicefiscale.is_valid("CCC-FBA-85-D03-L219-P", level="checksum"),
+    )
+    _benchmark_compare(
+        "is_valid - canonical input - level 'full'",
+        lambda: codicefiscale.is_valid("CCCFBA85D03L219P"),
+        "is_valid - messy input - level 'full'",
+        lambda: codicefiscale.is_valid("CCC-FBA-85-D03-L219-P"),
+    )
+
+
+def benchmark_decode_cache() -> None:
+    usec_reference = _benchmark(
+        "decode - cache disabled",
+        lambda: codicefiscale.decode("CCCFBA85D03L219P"),
+        number=1000,
+    )
+    codicefiscale.set_cache_maxsize(1000)
+    try:
+        usec = _benchmark(
+            "decode - cache hit",
+            lambda: codicefiscale.decode("CCCFBA85D03L219P"),
+            number=1000,
+        )
+    finally:
+        codicefiscale.set_cache_maxsize(0)
+    _print_speedup(usec_reference, usec)
+
+
+def benchmark_encode_names() -> None:
+    # "&" is not handled by the letters translation table, the name is slugified
+    _benchmark_compare(
+        "encode_lastname - latin chars",
+        lambda: codicefiscale.encode_lastname("D'Alessandro Niccolò"),
+        "encode_lastname - chars handled by slugify",
+        lambda: codicefiscale.encode_lastname("D'Alessandro Niccolò &"),
+    )
+
+
+def benchmark_encode() -> None:
+    args = ("Caccamo", "Fabio", "M", "03/04/1985", "Torino")
+    _benchmark_compare(
+        "encode - verify=False",
+        lambda: codicefiscale.encode(*args, verify=False),
+        "encode - verify=True",
+        lambda: codicefiscale.encode(*args),
+        number=1000,
+    )
+
+
+def benchmark_encode_parts() -> None:
+    _benchmark_compare(
+        "encode_parts",
+        lambda: codicefiscale.encode_parts(
+            lastname="Caccamo",
+            firstname="Fabio",
+            gender="M",
+            birthdate=date(1985, 4, 3),
+            birthplace_code="L219",
+        ),
+        "encode - verify=False",
+        lambda: codicefiscale.encode(
+            "Caccamo", "Fabio", "M", date(1985, 4, 3), "Torino", verify=False
+        ),
+    )
+
+
+def benchmark_encode_many() -> None:
+    records = [("Caccamo", "Fabio", "M", "03/04/1985", "Torino (TO)")] * 100
+    _benchmark_compare(
+        "encode_many - 100 records",
+        lambda: codicefiscale.encode_many(records),
+        "encode - 100 records",
+        lambda: [codicefiscale.encode(*record) for record in records],
+        number=10,
+    )
+
+
+def benchmark_encode_birthdate() -> None:
+    # "3 April 1985" is not handled by the fast parser and uses dateutil
+    _benchmark_compare(
+        "encode_birthdate - common format",
+        lambda: codicefiscale.encode_birthdate("03/04/1985", "M"),
+        "encode_birthdate - dateutil format",
+        lambda: codicefiscale.encode_birthdate("3 April 1985", "M"),
+    )
+
+
+def benchmark_encode_birthplace() -> None:
+    # the reference resolves the birthplace options without the cache
+    _benchmark_compare(
+        "encode_birthplace - cached",
+        lambda: codicefiscale.encode_birthplace("Torino (TO)"),
+        "encode_birthplace - options lookup, not cached",
+        lambda: (
+            codicefiscale._get_birthplace_options("Torino (TO)")
+            or codicefiscale._get_birthplace_options("Torino ")
+        ),
+        number=1000,
+    )
+
+
+def benchmark_omocodes() -> None:
+    _benchmark(
+        "omocodes - all",
+        lambda: list(codicefiscale.iter_omocodes("CCCFBA85D03L219P")),
+        number=1000,
+    )
+    _benchmark(
+        "omocodes - max_level=1",
+        lambda: list(codicefiscale.iter_omocodes("CCCFBA85D03L219P", max_level=1)),
+    )
+    _benchmark_compare(
+        "is_omocode",
+        lambda: codicefiscale.is_omocode("CCCFBA85D03LNMVE"),
+        "is_omocode - decode omocodes",
+        lambda: (
+            "CCCFBA85D03LNMVE"
+            in codicefiscale.decode("CCCFBA85D03LNMVE")["omocodes"][1:]
+        ),
+        number=1000,
+    )
+
+
+def main() -> None:
+    # load data before measuring
+    codicefiscale.decode("CCCFBA85D03L219P")
+    benchmark_decode_raw()
+    benchmark_encode_cin()
+    benchmark_is_valid()
+    benchmark_decode_cache()
+    benchmark_encode_names()
+    benchmark_encode()
+    benchmark_encode_parts()
+    benchmark_encode_many()
+    benchmark_encode_birthdate()
+    benchmark_encode_birthplace()
+    benchmark_omocodes()
+
+
+if __name__ == "__main__":
+    main()
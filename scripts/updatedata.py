@@ -6,6 +6,8 @@ import fsutil
 from benedict import benedict
 from slugify import slugify
 
+from codicefiscale.data import build_names_index, get_municipality_name_keys
+
 DATA_DIR: str = fsutil.join_path(__file__, "../src/codicefiscale/data/")
 
 
@@ -154,9 +156,27 @@ def _update_municipalities_data() -> None:
     items_data = [map_item(benedict(item)) for item in data["values"]]
     items_data_patch = _read_data_json("municipalities-patch.json")
 
+    # precompute the keys of the municipalities index (unicode slug,
+    # ascii slugs and province-qualified slugs) to avoid doing it at runtime
+    items_data = list(filter(bool, items_data + items_data_patch))
+    for item in items_data:
+        item["name_keys"] = get_municipality_name_keys(item)
+
     _write_data_json(
         filepath="municipalities.json",
-        data=items_data + items_data_patch,
+        data=items_data,
+    )
+
+
+def _update_names_index_data() -> None:
+    # precompute the firstname code -> names index to avoid doing it at runtime
+    names = _read_data_json("names.json")
+    names_index = build_names_index(names)
+    fsutil.write_file_json(
+        fsutil.join_filepath(DATA_DIR, "names-index.json"),
+        names_index,
+        indent=4,
+        sort_keys=True,
     )
 
 
@@ -181,6 +201,7 @@ def _write_data_json(filepath: str, data: Any) -> None:
 def main() -> None:
     _update_countries_data()
     _update_municipalities_data()
+    _update_names_index_data()
 
 
 if __name__ == "__main__":
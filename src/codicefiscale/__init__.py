@@ -1,16 +1,8 @@
-from codicefiscale.codicefiscale import (
-    decode,
-    decode_firstname,
-    decode_raw,
-    encode,
-    encode_birthdate,
-    encode_birthplace,
-    encode_cin,
-    encode_firstname,
-    encode_lastname,
-    is_omocode,
-    is_valid,
-)
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
 from codicefiscale.metadata import (
     __author__,
     __copyright__,
@@ -20,6 +12,39 @@ from codicefiscale.metadata import (
     __version__,
 )
 
+if TYPE_CHECKING:
+    from codicefiscale.codicefiscale import (
+        DecodeError,
+        DecodeResult,
+        ErrorReason,
+        cache_clear,
+        cache_info,
+        canonical_code,
+        decode,
+        decode_firstname,
+        decode_many,
+        decode_raw,
+        encode,
+        encode_birthdate,
+        encode_birthplace,
+        encode_cin,
+        encode_firstname,
+        encode_lastname,
+        encode_many,
+        encode_parts,
+        get_data_profile,
+        get_error_reason,
+        get_reference_date,
+        is_omocode,
+        is_valid,
+        iter_decode,
+        iter_encode,
+        iter_omocodes,
+        set_cache_maxsize,
+        set_data_profile,
+        set_reference_date,
+    )
+
 __all__ = [
     "__author__",
     "__copyright__",
@@ -27,8 +52,15 @@ __all__ = [
     "__license__",
     "__title__",
     "__version__",
+    "DecodeError",
+    "DecodeResult",
+    "ErrorReason",
+    "cache_clear",
+    "cache_info",
+    "canonical_code",
     "decode",
     "decode_firstname",
+    "decode_many",
     "decode_raw",
     "encode",
     "encode_birthdate",
@@ -36,6 +68,43 @@ __all__ = [
     "encode_cin",
     "encode_firstname",
     "encode_lastname",
+    "encode_many",
+    "encode_parts",
+    "get_data_profile",
+    "get_error_reason",
+    "get_reference_date",
     "is_omocode",
     "is_valid",
+    "iter_decode",
+    "iter_encode",
+    "iter_omocodes",
+    "set_cache_maxsize",
+    "set_data_profile",
+    "set_reference_date",
 ]
+
+
+# the submodules that were available as attributes when the api was eager
+_SUBMODULES: tuple[str, ...] = (
+    "codicefiscale",
+    "data",
+)
+
+
+def __getattr__(name: str) -> Any:
+    # the api is imported on first use, importing the package
+    # (eg. to get its version) doesn't load the codicefiscale module
+    if name in _SUBMODULES:
+        # importing the submodule sets it as package attribute
+        return importlib.import_module(f"{__name__}.{name}")
+    if name in __all__:
+        from codicefiscale import codicefiscale
+
+        value = getattr(codicefiscale, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -4,7 +4,9 @@ import sys
 from datetime import datetime
 from typing import Any
 
-from codicefiscale import __description__, __version__, codicefiscale
+# the package api is loaded lazily, only when a subcommand is run
+import codicefiscale
+from codicefiscale import __description__, __version__
 
 
 def _encode_from_args(args: argparse.Namespace) -> None:
@@ -24,12 +26,16 @@ def _encode_from_args(args: argparse.Namespace) -> None:
 
 def _decode_from_args(args: argparse.Namespace) -> None:
     try:
-        cf_data = codicefiscale.decode(args.code)
+        cf_result = codicefiscale.decode(args.code, lazy=True)
     except Exception as error:
         sys.stderr.write(f"{error}\n")
     else:
-        if not args.omocodes:
-            cf_data.pop("omocodes", None)
+        # omocodes are computed only if requested
+        cf_data = {
+            key: value
+            for key, value in cf_result.items()
+            if args.omocodes or key != "omocodes"
+        }
 
         def default_encoder(obj: Any) -> Any:
             if isinstance(obj, datetime):
@@ -1,20 +1,35 @@
 from __future__ import annotations
 
+import functools
 import re
 import string
-from datetime import datetime, timedelta
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from datetime import date as date_type
+from datetime import datetime
+from enum import IntEnum
 from itertools import combinations
 from re import Pattern
-from typing import Any, Literal, cast
-
-from dateutil import parser as date_parser
-from slugify import slugify
-
-from codicefiscale.data import get_indexed_data
+from typing import Any, Literal, cast, overload
+
+from codicefiscale.cache import CacheInfo, LRUCache
+from codicefiscale.data import (
+    Birthplace,
+    BirthplaceIntervals,
+    DataProfile,
+    IndexedData,
+    get_birthplace_code_index,
+    get_indexed_data,
+    parse_data_profile,
+)
+from codicefiscale.slug import get_letters, get_slug
 
-_CONSONANTS: list[str] = list("bcdfghjklmnpqrstvwxyz")
-_VOWELS: list[str] = list("aeiou")
+_CONSONANTS: str = "bcdfghjklmnpqrstvwxyz"
+_VOWELS: str = "aeiou"
+# names are reduced to lowercase ascii letters before selecting chars
+_CONSONANTS_TRANS: dict[int, int | None] = str.maketrans("", "", _VOWELS)
+_VOWELS_TRANS: dict[int, int | None] = str.maketrans("", "", _CONSONANTS)
 _MONTHS: list[str] = list("ABCDEHLMPRST")
+_MONTHS_DAYS: tuple[int, ...] = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
 _CIN: dict[str, tuple[int, int]] = {
     "0": (0, 1),
     "1": (1, 0),
@@ -55,6 +70,20 @@ _CIN: dict[str, tuple[int, int]] = {
 }
 _CIN_REMAINDERS: list[str] = list(string.ascii_uppercase)
 
+
+def _get_cin_table(index: int) -> bytes:
+    table = bytearray(256)
+    for char, values in _CIN.items():
+        table[ord(char)] = values[index]
+    return bytes(table)
+
+
+# byte -> CIN value translation tables, characters at odd positions
+# (1st, 3rd, ...) use the second value, at even positions the first one
+_CIN_ODD_TABLE: bytes = _get_cin_table(1)
+_CIN_EVEN_TABLE: bytes = _get_cin_table(0)
+_CIN_INVALID_CHARS: bytes = bytes(char for char in range(256) if chr(char) not in _CIN)
+
 _OMOCODIA: dict[str, str] = {
     "0": "L",
     "1": "M",
@@ -76,58 +105,265 @@ _OMOCODIA_DECODE_TRANS: dict[int, int] = "".maketrans(
     _OMOCODIA_LETTERS, _OMOCODIA_DIGITS
 )
 _OMOCODIA_SUBS_INDEXES: list[int] = list(reversed([6, 7, 9, 10, 12, 13, 14]))
-_OMOCODIA_SUBS_INDEXES_COMBINATIONS: list[list[int]] = [[]]
-for combo_size in range(1, len(_OMOCODIA_SUBS_INDEXES) + 1):
-    for combo in combinations(_OMOCODIA_SUBS_INDEXES, combo_size):
-        _OMOCODIA_SUBS_INDEXES_COMBINATIONS.append(list(combo))
 
+# digits values of the (omocodia) birthplace code chars, used to get the
+# codes index without translating the code to a new string
+_BIRTHPLACE_DIGITS: dict[str, int] = {
+    **{digit: int(digit) for digit in _OMOCODIA_DIGITS},
+    **{letter: int(digit) for digit, letter in _OMOCODIA.items()},
+}
+
+
+class ErrorReason(IntEnum):
+    """
+    The reason why a code is not valid.
+    """
+
+    SYNTAX = 1
+    CIN = 2
+    DATE = 3
+    BIRTHPLACE = 4
+    BIRTHPLACE_DATE = 5
+    OUT_OF_PROFILE = 6
+
+
+class DecodeError(ValueError):
+    """
+    Raised when a code is not valid, the reason is available as 'reason'.
+    """
+
+    def __init__(self, message: str, reason: ErrorReason) -> None:
+        super().__init__(message)
+        self.reason = reason
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (self.__class__, (str(self), self.reason))
+
+
+_DATA: IndexedData | None = None
 
-_DATA: dict[str, Any] | None = None
+# the subset of the data loaded, if None it is read from the environment
+_DATA_PROFILE: DataProfile | None = None
 
+# fixed reference date used to resolve the century of the birthdate year,
+# if None the current date is used
+_REFERENCE_DATE: date_type | None = None
 
-def _get_data() -> dict[str, Any]:
+# opt-in cache of decoded codes keyed by (normalized code, reference year)
+_DECODE_CACHE: LRUCache[tuple[str, int], DecodeResult | ErrorReason] | None = None
+
+_VALIDATION_LEVELS: tuple[str, ...] = ("syntax", "checksum", "date", "full")
+
+# max number of birthplaces resolved and kept in memory during a batch decode
+_BATCH_BIRTHPLACES_MAXSIZE: int = 65536
+
+# max number of values memoized by each component encoder during a batch encode
+_BATCH_ENCODE_CACHE_MAXSIZE: int = 16384
+
+# max number of distinct birthplace strings resolved by encode kept in memory
+_BIRTHPLACES_CACHE_MAXSIZE: int = 8192
+_BIRTHPLACES_CACHE: LRUCache[str, tuple[BirthplaceIntervals, ...]] = LRUCache(
+    _BIRTHPLACES_CACHE_MAXSIZE
+)
+
+
+def _get_data() -> IndexedData:
     global _DATA
     if _DATA is None:
-        _DATA = get_indexed_data()
+        _DATA = get_indexed_data(_get_data_profile())
     return _DATA
 
 
-CODICEFISCALE_RE: Pattern[str] = re.compile(
+def _get_data_profile() -> DataProfile:
+    global _DATA_PROFILE
+    if _DATA_PROFILE is None:
+        _DATA_PROFILE = parse_data_profile()
+    return _DATA_PROFILE
+
+
+def get_data_profile() -> str:
+    """
+    Gets the name of the data profile, the subset of the data loaded.
+
+    :returns: The data profile name ('full', 'since:YEAR' or 'codes-only')
+    :rtype: string
+    """
+    return _get_data_profile().name
+
+
+def set_data_profile(profile: str | None) -> None:
+    """
+    Sets the data profile, the subset of the data loaded:
+
+    - 'full': all the data (default)
+    - 'since:YEAR': only the birthplaces for birthdates since the given year
+    - 'codes-only': only the birthplace codes, without the alternative names,
+      birthplaces can't be encoded by name
+
+    Inputs out of the profile are reported as errors.
+    The data and the caches are cleared and loaded again on first use.
+
+    :param profile: The data profile, if None the 'CODICEFISCALE_DATA_PROFILE'
+        environment variable or 'full' is used
+    :type profile: string or None
+    """
+    global _DATA, _DATA_PROFILE
+    _DATA_PROFILE = parse_data_profile(profile)
+    _DATA = None
+    _BIRTHPLACES_CACHE.clear()
+    cache_clear()
+
+
+def _is_out_of_profile(birthdate: date_type) -> bool:
+    since = _get_data_profile().since
+    return since is not None and birthdate.toordinal() < since.toordinal()
+
+
+def get_reference_date() -> date_type:
+    """
+    Gets the reference date used to resolve the century of decoded birthdates.
+
+    :returns: The reference date set with `set_reference_date` or the current date.
+    :rtype: date
+    """
+    return _REFERENCE_DATE or datetime.now().date()
+
+
+def set_reference_date(reference_date: date_type | None) -> None:
+    """
+    Sets the reference date used to resolve the century of decoded birthdates.
+
+    A 2 digits birthdate year is resolved to the most recent year not after
+    the reference date year, fixing it makes decoding results reproducible.
+
+    :param reference_date: The reference date, None to use the current date
+    :type reference_date: date or None
+    """
+    global _REFERENCE_DATE
+    _REFERENCE_DATE = reference_date
+
+
+def _get_current_year(reference_date: date_type | None) -> int:
+    return (reference_date or get_reference_date()).year
+
+
+def set_cache_maxsize(maxsize: int) -> None:
+    """
+    Sets the max size of the cache of decoded codes used by
+    `decode`, `is_valid` and `get_error_reason` (level 'full').
+
+    The cache is disabled by default, the least recently used codes
+    are evicted when the max size is reached.
+    Changing the max size clears the cache.
+
+    :param maxsize: The max number of cached codes, 0 to disable the cache
+    :type maxsize: int
+    """
+    global _DECODE_CACHE
+    if maxsize < 0:
+        raise ValueError(
+            f"[codicefiscale] 'maxsize' argument must be greater than "
+            f"or equal to 0, not: {maxsize!r}"
+        )
+    _DECODE_CACHE = LRUCache(maxsize) if maxsize else None
+
+
+def cache_info() -> CacheInfo:
+    """
+    Gets the statistics of the cache of decoded codes.
+
+    :returns: The hits, misses, evictions, maxsize and currsize values.
+    :rtype: CacheInfo
+    """
+    cache = _DECODE_CACHE
+    if cache is None:
+        return CacheInfo(hits=0, misses=0, evictions=0, maxsize=0, currsize=0)
+    return cache.info()
+
+
+def cache_clear() -> None:
+    """
+    Clears the cache of decoded codes and its statistics.
+    """
+    cache = _DECODE_CACHE
+    if cache is not None:
+        cache.clear()
+
+
+_CODICEFISCALE_RE_PATTERN: str = (
     r"^"
     r"(?P<lastname>[a-z]{3})"
     r"(?P<firstname>[a-z]{3})"
     r"(?P<birthdate>(?P<birthdate_year>[a-z\d]{2})(?P<birthdate_month>[abcdehlmprst]{1})(?P<birthdate_day>[a-z\d]{2}))"  # noqa: B950, E501
     r"(?P<birthplace>[a-z]{1}[a-z\d]{3})"
-    r"(?P<cin>[a-z]{1})$",
-    re.IGNORECASE,
+    r"(?P<cin>[a-z]{1})$"
 )
 
+# compiled on first use (see __getattr__)
+CODICEFISCALE_RE: Pattern[str]
+
+
+@functools.cache
+def _get_codicefiscale_re() -> Pattern[str]:
+    return re.compile(_CODICEFISCALE_RE_PATTERN, re.IGNORECASE)
 
-def _get_consonants(s: str) -> list[str]:
-    return [char for char in s if char in _CONSONANTS]
 
+def __getattr__(name: str) -> Any:
+    if name == "CODICEFISCALE_RE":
+        return _get_codicefiscale_re()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+_NAME_CODE_RE: Pattern[str] = re.compile(r"[A-Z]{3}")
+_BIRTHPLACE_CODE_RE: Pattern[str] = re.compile(r"[A-Z][0-9]{3}")
+
+# common birthdate formats parsed without dateutil, separators: space - . /
+_DATE_YEARFIRST_RE: Pattern[str] = re.compile(
+    r"^\s*(\d{4})[\s./-](\d{1,2})[\s./-](\d{1,2})\s*$",
+    re.ASCII,
+)
+_DATE_DAYFIRST_RE: Pattern[str] = re.compile(
+    r"^\s*(\d{1,2})[\s./-](\d{1,2})[\s./-](\d{4})\s*$",
+    re.ASCII,
+)
 
-def _get_vowels(s: str) -> list[str]:
-    return [char for char in s if char in _VOWELS]
+
+def _get_consonants(letters: str) -> str:
+    return letters.translate(_CONSONANTS_TRANS)
+
+
+def _get_vowels(letters: str) -> str:
+    return letters.translate(_VOWELS_TRANS)
 
 
 def _get_consonants_and_vowels(
-    consonants: list[str],
-    vowels: list[str],
+    consonants: str,
+    vowels: str,
 ) -> str:
-    return "".join(list(consonants[:3] + vowels[:3] + (["X"] * 3))[:3]).upper()
+    return f"{consonants[:3]}{vowels[:3]}XXX"[:3].upper()
 
 
-def _get_date(
-    date: datetime | str | None,
-    separator: str = "-",
-) -> datetime | None:
-    if not date:
+def _get_date_from_string(date: str) -> datetime | None:
+    match = _DATE_YEARFIRST_RE.match(date)
+    if match:
+        year, month, day = match.groups()
+    else:
+        match = _DATE_DAYFIRST_RE.match(date)
+        if not match:
+            return None
+        day, month, year = match.groups()
+    try:
+        return datetime(int(year), int(month), int(day))
+    except ValueError:
+        # let dateutil resolve ambiguous values (eg. month > 12)
         return None
-    if isinstance(date, datetime):
-        date = date.replace(tzinfo=None)
-        return date
-    date_slug = slugify(date)
+
+
+def _parse_date(date: str) -> datetime | None:
+    # dateutil is imported only if needed
+    from dateutil import parser as date_parser
+
+    date_slug = get_slug(date)
     date_parts = date_slug.split("-")[:3]
     date_parser_options = (
         {
@@ -149,106 +385,158 @@ def _get_date(
         return None
 
 
+def _get_date(date: datetime | date_type | str | None) -> datetime | None:
+    if not date:
+        return None
+    if isinstance(date, datetime):
+        date = date.replace(tzinfo=None)
+        return date
+    if isinstance(date, date_type):
+        return datetime(date.year, date.month, date.day)
+    # dateutil is used only for the formats not handled by the fast parser
+    return _get_date_from_string(date) or _parse_date(date)
+
+
+def _get_birthplace_options(birthplace: str) -> BirthplaceIntervals | None:
+    data = _get_data()
+    municipalities = data["municipalities"]
+    birthplace_options = municipalities.get(get_slug(birthplace, allow_unicode=True))
+    if birthplace_options:
+        return cast(BirthplaceIntervals, birthplace_options)
+    birthplace_slug = get_slug(birthplace)
+    birthplace_options = municipalities.get(birthplace_slug)
+    if not birthplace_options:
+        birthplace_options = data["countries"].get(birthplace_slug)
+    if birthplace_options:
+        return cast(BirthplaceIntervals, birthplace_options)
+    code_index = get_birthplace_code_index(birthplace_slug.upper())
+    if code_index is None:
+        return None
+    return cast(BirthplaceIntervals | None, data["codes"][code_index])
+
+
+def _resolve_birthplace(birthplace: str) -> tuple[BirthplaceIntervals, ...]:
+    # resolved candidates are cached by input string, misses included
+    candidates = _BIRTHPLACES_CACHE.get(birthplace, None)
+    if candidates is not None:
+        return candidates
+    birthplace_options = _get_birthplace_options(birthplace)
+    candidates = (birthplace_options,) if birthplace_options else ()
+    birthplace_without_province = re.split(r",|\(", birthplace)[0]
+    if birthplace_without_province != birthplace:
+        birthplace_options = _get_birthplace_options(birthplace_without_province)
+        if birthplace_options and birthplace_options not in candidates:
+            candidates += (birthplace_options,)
+    _BIRTHPLACES_CACHE.set(birthplace, candidates)
+    return candidates
+
+
 def _get_birthplace(
     birthplace: str,
-    birthdate: datetime | str | None = None,
-) -> dict[str, Any] | None:
-    birthplace_unicode_slug = slugify(birthplace, allow_unicode=True)
-    birthplace_slug = slugify(birthplace)
-    birthplace_code = birthplace_slug.upper()
-    data = _get_data()
-    birthplaces_options = data["municipalities"].get(
-        birthplace_unicode_slug,
-        data["municipalities"].get(
-            birthplace_slug,
-            data["countries"].get(
-                birthplace_slug,
-                data["codes"].get(
-                    birthplace_code,
-                ),
-            ),
-        ),
+    birthdate: datetime | date_type | str | None = None,
+) -> Birthplace | None:
+    candidates = _resolve_birthplace(birthplace)
+    if not candidates:
+        return None
+    birthdate_date = _get_date(birthdate)
+    for birthplace_options in candidates:
+        birthplace_data = birthplace_options.get(birthdate_date)
+        if birthplace_data:
+            return birthplace_data
+    return None
+
+
+def _get_birthplace_by_code(
+    birthplace_code: str,
+    birthdate: date_type,
+) -> Birthplace | None:
+    code_index = get_birthplace_code_index(birthplace_code)
+    if code_index is None:
+        return None
+    return _get_birthplace_by_code_index(code_index, birthdate)
+
+
+def _get_birthplace_by_code_index(
+    code_index: int,
+    birthdate: date_type,
+) -> Birthplace | None:
+    birthplaces_options = cast(
+        BirthplaceIntervals | None,
+        _get_data()["codes"][code_index],
     )
     if not birthplaces_options:
         return None
+    return birthplaces_options.get(birthdate)
 
-    birthdate_date = _get_date(birthdate)
-    if not birthdate_date:
-        return cast(dict[str, Any], birthplaces_options[0].copy())
-
-    # search birthplace that has been created before / deleted after birthdate
-    for birthplace_option in birthplaces_options:
-        date_created = _get_date(birthplace_option["date_created"]) or datetime.min
-        date_deleted = _get_date(birthplace_option["date_deleted"]) or datetime.max
-        # print(birthdate_date, date_created, date_deleted)
-        if birthdate_date >= date_created and birthdate_date <= date_deleted:
-            return cast(dict[str, Any], birthplace_option.copy())
-
-    return _get_birthplace_fallback(birthplaces_options, birthdate_date)
-
-
-def _get_birthplace_fallback(
-    birthplaces_options: list[dict[str, Any]],
-    birthdate_date: datetime,
-) -> dict[str, Any] | None:
-    # avoid wrong birthplace code error when birthdate falls in
-    # missing date-range in the data-source even if birthplace code is valid
-    birthplaces_options_count = len(birthplaces_options)
-    if birthplaces_options_count > 1:
-        for index in range(birthplaces_options_count - 1):
-            birthplace_option = birthplaces_options[index]
-            birthplace_option_next = birthplaces_options[(index + 1)]
-            date_deleted = _get_date(birthplace_option["date_deleted"])
-            date_created = _get_date(birthplace_option_next["date_created"])
-            if date_deleted and date_created:
-                if birthdate_date >= date_deleted and date_deleted <= date_created:
-                    # the birthdate is in between a deleted munipality and a created one
-                    # if the deleted one has a very short active time delta,
-                    # it means that probably the deleted_at value is wrong
-                    date_created = _get_date(birthplace_option["date_created"])
-                    date_deleted = _get_date(birthplace_option["date_deleted"])
-                    if date_created and date_deleted:
-                        date_delta = date_deleted - date_created
-                        if date_delta <= timedelta(days=1):
-                            return birthplace_option.copy()
-                    return birthplace_option_next.copy()
-
-    # Fix issues #210, #213
-    # sometimes the code has been assigned after date of birth and
-    # the municipality was not yet active at birthdate time,
-    # let's return the first municipality created after birthdate_date
-    for index in range(birthplaces_options_count):
-        birthplace_option = birthplaces_options[index]
-        date_created = _get_date(birthplace_option["date_created"])
-        if date_created:
-            if birthdate_date <= date_created:
-                return birthplace_option.copy()
-    return None
 
+def _get_code_root(code: str) -> str:
+    # translate omocodia letters back to digits only in the substitutable
+    # positions, month and birthplace first char are letters too
+    trans = _OMOCODIA_DECODE_TRANS
+    return (
+        f"{code[0:6]}{code[6:8].translate(trans)}{code[8]}"
+        f"{code[9:11].translate(trans)}{code[11]}{code[12:15].translate(trans)}"
+    )
 
-def _get_omocode(
-    code: str,
-    subs: list[int],
-    trans: dict[int, int],
-) -> str:
-    code_chars = list(code[0:15])
-    for i in subs:
-        code_chars[i] = code_chars[i].translate(trans)
-    code = "".join(code_chars)
-    code_cin = encode_cin(code)
-    code += code_cin
-    return code
+
+def _iter_omocodes(code: str, max_level: int) -> Iterator[str]:
+    code_chars = list(_get_code_root(code))
+
+    # the CIN of each omocode is computed incrementally: the checksum
+    # delta of each substituted char is added to the root code checksum
+    cin_tot = 0
+    for i, char in enumerate(code_chars):
+        cin_tot += _CIN[char][(i + 1) % 2]
+    subs_chars: dict[int, str] = {}
+    subs_cin_deltas: dict[int, int] = {}
+    for i in _OMOCODIA_SUBS_INDEXES:
+        char = code_chars[i]
+        char_sub = char.translate(_OMOCODIA_ENCODE_TRANS)
+        subs_chars[i] = char_sub
+        subs_cin_deltas[i] = _CIN[char_sub][(i + 1) % 2] - _CIN[char][(i + 1) % 2]
+
+    for level in range(max_level + 1):
+        for subs in combinations(_OMOCODIA_SUBS_INDEXES, level):
+            omocode_chars = code_chars.copy()
+            omocode_cin_tot = cin_tot
+            for i in subs:
+                omocode_chars[i] = subs_chars[i]
+                omocode_cin_tot += subs_cin_deltas[i]
+            omocode_chars.append(_CIN_REMAINDERS[omocode_cin_tot % 26])
+            yield "".join(omocode_chars)
 
 
 def _get_omocodes(code: str) -> list[str]:
-    code_root = _get_omocode(
-        code, subs=_OMOCODIA_SUBS_INDEXES, trans=_OMOCODIA_DECODE_TRANS
-    )
-    codes = [
-        _get_omocode(code_root, subs=subs, trans=_OMOCODIA_ENCODE_TRANS)
-        for subs in _OMOCODIA_SUBS_INDEXES_COMBINATIONS
-    ]
-    return codes
+    return list(_iter_omocodes(code, max_level=len(_OMOCODIA_SUBS_INDEXES)))
+
+
+def iter_omocodes(
+    code: str | bytes | bytearray | memoryview,
+    max_level: int | None = None,
+) -> Iterator[str]:
+    """
+    Iterates over the omocodes of the specified code, lazily.
+
+    Omocodes are ordered by substitution level: the base code (level 0) first,
+    then the codes with 1 digit replaced by a letter, 2 digits, ... up to 7.
+
+    :param code: The code
+    :type code: string or bytes-like
+    :param max_level: The max substitution level, None for all levels
+    :type max_level: int or None
+
+    :returns: The omocodes iterator.
+    :rtype: iterator of strings
+    """
+    raw = decode_raw(code)
+    subs_count = len(_OMOCODIA_SUBS_INDEXES)
+    if max_level is None:
+        max_level = subs_count
+    if max_level < 0:
+        raise ValueError(
+            f"[codicefiscale] 'max_level' argument must be >= 0, not: {max_level}"
+        )
+    return _iter_omocodes(raw["code"], max_level=min(max_level, subs_count))
 
 
 def encode_lastname(lastname: str) -> str:
@@ -261,9 +549,12 @@ def encode_lastname(lastname: str) -> str:
     :returns: The code used in italian fiscal code
     :rtype: string
     """
-    lastname_slug = slugify(lastname)
-    lastname_consonants = _get_consonants(lastname_slug)
-    lastname_vowels = _get_vowels(lastname_slug)
+    return _encode_lastname_letters(get_letters(lastname))
+
+
+def _encode_lastname_letters(lastname_letters: str) -> str:
+    lastname_consonants = _get_consonants(lastname_letters)
+    lastname_vowels = _get_vowels(lastname_letters)
     lastname_code = _get_consonants_and_vowels(lastname_consonants, lastname_vowels)
     return lastname_code
 
@@ -278,13 +569,16 @@ def encode_firstname(firstname: str) -> str:
     :returns: The code used in italian fiscal code
     :rtype: string
     """
-    firstname_slug = slugify(firstname)
-    firstname_consonants = _get_consonants(firstname_slug)
+    return _encode_firstname_letters(get_letters(firstname))
+
+
+def _encode_firstname_letters(firstname_letters: str) -> str:
+    firstname_consonants = _get_consonants(firstname_letters)
 
     if len(firstname_consonants) > 3:
-        del firstname_consonants[1]
+        firstname_consonants = firstname_consonants[0] + firstname_consonants[2:]
 
-    firstname_vowels = _get_vowels(firstname_slug)
+    firstname_vowels = _get_vowels(firstname_letters)
     firstname_code = _get_consonants_and_vowels(firstname_consonants, firstname_vowels)
     return firstname_code
 
@@ -327,14 +621,14 @@ def decode_firstname(
 
 
 def encode_birthdate(
-    birthdate: datetime | str | None,
+    birthdate: datetime | date_type | str | None,
     gender: Literal["m", "M", "f", "F"],
 ) -> str:
     """
     Encodes birthdate to the code used in italian fiscal code.
 
     :param birthdate: The birthdate
-    :type birthdate: datetime or string
+    :type birthdate: date, datetime or string
     :param gender: The gender, 'M' or 'F'
     :type gender: string
 
@@ -362,7 +656,7 @@ def encode_birthdate(
 
 def encode_birthplace(
     birthplace: str,
-    birthdate: datetime | str | None = None,
+    birthdate: datetime | date_type | str | None = None,
 ) -> str | None:
     """
     Encodes birthplace to the code used in italian fiscal code.
@@ -376,14 +670,24 @@ def encode_birthplace(
     if not birthplace:
         raise ValueError("[codicefiscale] 'birthplace' argument cant be None")
 
-    birthplace_without_province = re.split(r",|\(", birthplace)[0]
-    birthplace_data = _get_birthplace(
-        birthplace,
-        birthdate,
-    ) or _get_birthplace(
-        birthplace_without_province,
-        birthdate,
-    )
+    profile = _get_data_profile()
+    if profile.since and birthdate is not None:
+        birthdate_date = _get_date(birthdate)
+        if birthdate_date and _is_out_of_profile(birthdate_date):
+            raise ValueError(
+                f"[codicefiscale] 'birthdate' argument ({birthdate!r}) "
+                f"out of data profile {profile.name!r}"
+            )
+
+    # the whole string is looked up first, then without province / country
+    birthplace_data = _get_birthplace(birthplace, birthdate)
+
+    if not birthplace_data and profile.codes_only:
+        raise ValueError(
+            f"[codicefiscale] 'birthplace' argument ({birthplace!r}) not mapped "
+            f"to code, birthplace names are not available in data profile "
+            f"{profile.name!r}"
+        )
 
     if not birthplace_data:
         raise ValueError(
@@ -391,16 +695,16 @@ def encode_birthplace(
             f"({birthplace!r} / {birthdate!r}) not mapped to code"
         )
 
-    birthplace_code = str(birthplace_data["code"])
+    birthplace_code = birthplace_data.code
     return birthplace_code
 
 
-def encode_cin(code: str) -> str:
+def encode_cin(code: str | bytes | bytearray) -> str:
     """
     Encodes cin to the code used in italian fiscal code.
 
-    :param code: The code
-    :type code: string
+    :param code: The code (uppercase)
+    :type code: string or bytes
 
     :returns: The code used in italian fiscal code
     :rtype: string
@@ -414,12 +718,13 @@ def encode_cin(code: str) -> str:
             f"[codicefiscale] 'code' length must be 15 or 16, not: {code_len}"
         )
 
-    cin_tot = 0
-    for i, char in enumerate(code[0:15]):
-        cin_tot += _CIN[char][int(bool((i + 1) % 2))]
-    cin_code = _CIN_REMAINDERS[cin_tot % 26]
-
-    # print(cin_code)
+    code_bytes = code.encode("latin-1", "replace") if isinstance(code, str) else code
+    # invalid chars are deleted by translate and detected by the length
+    cin_odd_values = code_bytes[0:15:2].translate(_CIN_ODD_TABLE, _CIN_INVALID_CHARS)
+    cin_even_values = code_bytes[1:15:2].translate(_CIN_EVEN_TABLE, _CIN_INVALID_CHARS)
+    if len(cin_odd_values) + len(cin_even_values) != 15:
+        raise ValueError(f"[codicefiscale] 'code' contains invalid chars: {code!r}")
+    cin_code = _CIN_REMAINDERS[(sum(cin_odd_values) + sum(cin_even_values)) % 26]
     return cin_code
 
 
@@ -427,8 +732,10 @@ def encode(
     lastname: str,
     firstname: str,
     gender: Literal["m", "M", "f", "F"],
-    birthdate: datetime | str | None,
+    birthdate: datetime | date_type | str | None,
     birthplace: str,
+    *,
+    verify: bool = True,
 ) -> str:
     """
     Encodes the italian fiscal code.
@@ -440,9 +747,12 @@ def encode(
     :param gender: The gender, 'M' or 'F'
     :type gender: string
     :param birthdate: The birthdate
-    :type birthdate: datetime or string
+    :type birthdate: date, datetime or string
     :param birthplace: The birthplace
     :type birthplace: string
+    :param verify: If True, checks the encoded code as `decode` does,
+        can be disabled to skip the check when encoding trusted data
+    :type verify: bool
 
     :returns: The italian fiscal code
     :rtype: string
@@ -456,28 +766,231 @@ def encode(
     cin_code = encode_cin(code)
     code = f"{code}{cin_code}"
 
-    # raise ValueError if code is not valid
-    decode(code)
+    if verify:
+        # raise ValueError if code is not valid
+        _check_code(code, _get_current_year(None))
     return code
 
 
-def decode_raw(code: str) -> dict[str, str]:
+def _get_name_code(
+    name: str | None,
+    name_code: str | None,
+    name_argname: str,
+    encode_name_letters: Callable[[str], str],
+) -> str:
+    if name_code is not None:
+        if not _NAME_CODE_RE.fullmatch(name_code):
+            raise ValueError(
+                f"[codicefiscale] '{name_argname}_code' argument must be "
+                f"3 uppercase letters, not: {name_code!r}"
+            )
+        return name_code
+    if name is None:
+        raise ValueError(
+            f"[codicefiscale] '{name_argname}' or '{name_argname}_code' "
+            "argument is required"
+        )
+    return encode_name_letters(get_letters(name))
+
+
+def encode_parts(
+    *,
+    lastname: str | None = None,
+    lastname_code: str | None = None,
+    firstname: str | None = None,
+    firstname_code: str | None = None,
+    gender: Literal["m", "M", "f", "F"],
+    birthdate: date_type,
+    birthplace_code: str,
+) -> str:
     """
-    Decodes the raw data associated to the code.
+    Encodes the italian fiscal code from already normalized components.
 
-    :param code: The code
-    :type code: string
+    Names can be passed already encoded (eg. lastname_code='CCC').
+    The birthplace is passed as Belfiore code (eg. 'L219') and is not
+    resolved by name, but it is checked against the birthdate.
 
-    :returns: The raw data associated to the code.
-    :rtype: dict
+    :param lastname: The lastname, required if lastname_code is None
+    :type lastname: string
+    :param lastname_code: The lastname code
+    :type lastname_code: string
+    :param firstname: The firstname, required if firstname_code is None
+    :type firstname: string
+    :param firstname_code: The firstname code
+    :type firstname_code: string
+    :param gender: The gender, 'M' or 'F'
+    :type gender: string
+    :param birthdate: The birthdate
+    :type birthdate: date or datetime
+    :param birthplace_code: The birthplace code
+    :type birthplace_code: string
+
+    :returns: The italian fiscal code
+    :rtype: string
+    """
+    lastname_code = _get_name_code(
+        lastname, lastname_code, "lastname", _encode_lastname_letters
+    )
+    firstname_code = _get_name_code(
+        firstname, firstname_code, "firstname", _encode_firstname_letters
+    )
+
+    if not isinstance(birthdate, date_type):
+        raise ValueError(
+            f"[codicefiscale] 'birthdate' argument must be a date, not: {birthdate!r}"
+        )
+    birthdate_code = encode_birthdate(birthdate, gender)
+
+    if not _BIRTHPLACE_CODE_RE.fullmatch(birthplace_code):
+        raise ValueError(
+            "[codicefiscale] 'birthplace_code' argument must be a valid "
+            f"code (eg. 'L219'), not: {birthplace_code!r}"
+        )
+    if _is_out_of_profile(birthdate):
+        raise ValueError(
+            f"[codicefiscale] 'birthdate' argument ({birthdate!r}) "
+            f"out of data profile {get_data_profile()!r}"
+        )
+    if not _get_birthplace_by_code(birthplace_code, birthdate):
+        raise ValueError(
+            "[codicefiscale] 'birthplace_code' / 'birthdate' arguments "
+            f"({birthplace_code!r} / {birthdate!r}) not mapped to birthplace"
+        )
+
+    code = f"{lastname_code}{firstname_code}{birthdate_code}{birthplace_code}"
+    return f"{code}{encode_cin(code)}"
+
+
+def _check_code(code: str, current_year: int) -> None:
+    # same checks of decode, without building the decoded data
+    result = _decode_normalized(code, current_year, None)
+    if isinstance(result, ErrorReason):
+        raise _get_code_error(code, result, current_year)
+
+
+def iter_encode(
+    records: Iterable[Mapping[str, Any] | Sequence[Any]],
+    *,
+    verify: bool = True,
+) -> Iterator[str | ValueError]:
+    """
+    Encodes many italian fiscal codes lazily, one at a time.
+
+    Each record is a dict with 'lastname', 'firstname', 'gender', 'birthdate'
+    and 'birthplace' keys or a tuple with the same values in the same order
+    (the `encode` arguments). The components encoding is memoized during
+    the iteration, repeated names, birthdates and birthplaces are encoded once.
+    Invalid records don't stop the iteration, the ValueError that would
+    be raised by `encode` is yielded in place of the code, malformed records
+    (eg. missing values or values of a wrong type) are yielded as ValueError too.
+
+    :param records: The records
+    :type records: iterable of dicts or tuples
+    :param verify: If True, checks each encoded code (see `encode`)
+    :type verify: bool
+
+    :returns: The italian fiscal code of each record or the error.
+    :rtype: iterator of strings or ValueError
+    """
+    current_year = _get_current_year(None)
+    memoize = functools.lru_cache(maxsize=_BATCH_ENCODE_CACHE_MAXSIZE)
+    encode_lastname_memoized = memoize(encode_lastname)
+    encode_firstname_memoized = memoize(encode_firstname)
+    encode_birthdate_memoized = memoize(encode_birthdate)
+    encode_birthplace_memoized = memoize(encode_birthplace)
+
+    for record in records:
+        try:
+            if isinstance(record, Mapping):
+                lastname = record["lastname"]
+                firstname = record["firstname"]
+                gender = record["gender"]
+                birthdate = record["birthdate"]
+                birthplace = record["birthplace"]
+            else:
+                lastname, firstname, gender, birthdate, birthplace = record
+        except (KeyError, TypeError, ValueError) as error:
+            # eg. a dict record without a key, or a tuple record
+            # with a wrong number of values
+            yield _get_invalid_record_error(record, error)
+            continue
+        try:
+            code = (
+                f"{encode_lastname_memoized(lastname)}"
+                f"{encode_firstname_memoized(firstname)}"
+                f"{encode_birthdate_memoized(birthdate, gender)}"
+                f"{encode_birthplace_memoized(birthplace, birthdate)}"
+            )
+            code = f"{code}{encode_cin(code)}"
+            if verify:
+                _check_code(code, current_year)
+        except ValueError as error:
+            yield error
+        except TypeError as error:
+            # eg. a None name, or an unhashable birthdate
+            yield _get_invalid_record_error(record, error)
+        else:
+            yield code
+
+
+def _get_invalid_record_error(record: Any, error: Exception) -> ValueError:
+    invalid_record_error = ValueError(
+        f"[codicefiscale] invalid record: {record!r} ({error!r})"
+    )
+    invalid_record_error.__cause__ = error
+    return invalid_record_error
+
+
+def encode_many(
+    records: Iterable[Mapping[str, Any] | Sequence[Any]],
+    *,
+    verify: bool = True,
+) -> list[str | ValueError]:
+    """
+    Encodes many italian fiscal codes.
+
+    Invalid records don't raise, the ValueError that would be raised
+    by `encode` is returned in place of the code (see `iter_encode`).
+
+    :param records: The records
+    :type records: iterable of dicts or tuples
+    :param verify: If True, checks each encoded code (see `encode`)
+    :type verify: bool
+
+    :returns: The italian fiscal code of each record or the error, in the same order.
+    :rtype: list of strings or ValueError
     """
-    code = slugify(code)
+    return list(iter_encode(records, verify=verify))
+
+
+def _normalize_code(code: str | bytes | bytearray | memoryview) -> str:
+    if isinstance(code, (bytes, bytearray, memoryview)):
+        # latin-1 never fails, non-ascii bytes are not normalized (their
+        # encoding is unknown) and the code doesn't match the syntax,
+        # the same as the vectorized validation
+        code = bytes(code).decode("latin-1")
+        if not code.isascii():
+            return code.upper()
+    elif not isinstance(code, str):
+        # bytes(int) would allocate a zeroed buffer of that size
+        raise TypeError(
+            "[codicefiscale] 'code' argument must be a string or bytes-like object, "
+            f"not {type(code).__name__!r}"
+        )
+    # fast path: canonical input (eg. 'CCCFBA85D03L219P') doesn't need
+    # to be slugified, ascii alphanumeric chars would be only lowercased
+    if code.isascii() and code.isalnum():
+        return code.upper()
+    code = get_slug(code)
     code = code.replace("-", "")
     code = code.upper()
+    return code
+
 
-    match = CODICEFISCALE_RE.match(code)
+def _get_raw(code: str) -> dict[str, str] | None:
+    match = _get_codicefiscale_re().match(code)
     if not match:
-        raise ValueError(f"[codicefiscale] invalid syntax: {code}")
+        return None
 
     data = {
         "code": code,
@@ -494,122 +1007,746 @@ def decode_raw(code: str) -> dict[str, str]:
     return data
 
 
-def decode(code: str) -> dict[str, Any]:  # noqa: C901
+def decode_raw(code: str | bytes | bytearray | memoryview) -> dict[str, str]:
     """
-    Decodes the italian fiscal code.
+    Decodes the raw data associated to the code.
 
     :param code: The code
-    :type code: string
+    :type code: string or bytes-like
 
-    :returns: The data associated to the code and some additional info.
+    :returns: The raw data associated to the code.
     :rtype: dict
     """
-    raw = decode_raw(code)
+    code = _normalize_code(code)
+    raw = _get_raw(code)
+    if raw is None:
+        raise _get_syntax_error(code)
+    return raw
 
-    code = raw["code"]
 
-    birthdate_year = int(raw["birthdate_year"].translate(_OMOCODIA_DECODE_TRANS))
+class DecodeResult(Mapping[str, Any]):
+    """
+    The data associated to a decoded italian fiscal code.
+
+    It can be used as a read-only dict with the same keys returned by `decode`,
+    the most expensive values ('omocodes', 'firstname_options' and 'birthplace')
+    are computed only on first access and then cached.
+    """
+
+    __slots__ = (
+        "_code",
+        "_gender",
+        "_birthdate",
+        "_birthplace_data",
+        "_raw",
+        "_birthplace",
+        "_omocodes",
+        "_firstname_options",
+    )
+
+    _keys: tuple[str, ...] = (
+        "code",
+        "omocodes",
+        "gender",
+        "birthdate",
+        "birthplace",
+        "firstname_options",
+        "raw",
+    )
+
+    def __init__(
+        self,
+        code: str,
+        gender: Literal["M", "F"],
+        birthdate: datetime,
+        birthplace: Birthplace,
+        raw: dict[str, str],
+    ) -> None:
+        self._code = code
+        self._gender = gender
+        self._birthdate = birthdate
+        self._birthplace_data = birthplace
+        self._raw = raw
+        self._birthplace: dict[str, Any] | None = None
+        self._omocodes: list[str] | None = None
+        self._firstname_options: list[str] | None = None
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._keys:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(code={self._code!r})"
+
+    @property
+    def code(self) -> str:
+        return self._code
+
+    @property
+    def gender(self) -> Literal["M", "F"]:
+        return self._gender
+
+    @property
+    def birthdate(self) -> datetime:
+        return self._birthdate
+
+    @property
+    def birthplace(self) -> dict[str, Any]:
+        if self._birthplace is None:
+            # the record is converted to dict only when accessed
+            self._birthplace = self._birthplace_data.to_dict()
+        return self._birthplace
+
+    @property
+    def omocodes(self) -> list[str]:
+        if self._omocodes is None:
+            self._omocodes = _get_omocodes(self._code)
+        return self._omocodes
+
+    @property
+    def firstname_options(self) -> list[str]:
+        if self._firstname_options is None:
+            # add possible first names if birthplace is in Italy (not foreign country)
+            firstname_options = None
+            is_foreign = self._birthplace_data.province == "EE"
+            if not is_foreign:
+                firstname_options = decode_firstname(
+                    self._raw["firstname"], self._gender
+                )
+            self._firstname_options = firstname_options or []
+        return self._firstname_options
+
+    @property
+    def raw(self) -> dict[str, str]:
+        return self._raw
+
+    def _copy(self) -> DecodeResult:
+        result = DecodeResult(
+            code=self._code,
+            gender=self._gender,
+            birthdate=self._birthdate,
+            birthplace=self._birthplace_data,
+            raw=self._raw.copy(),
+        )
+        if self._omocodes is not None:
+            result._omocodes = list(self._omocodes)
+        if self._firstname_options is not None:
+            result._firstname_options = list(self._firstname_options)
+        return result
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Gets the data as a new dict, the same returned by `decode`.
+
+        :returns: The data associated to the code and some additional info.
+        :rtype: dict
+        """
+        return {
+            "code": self.code,
+            "omocodes": list(self.omocodes),
+            "gender": self.gender,
+            "birthdate": self.birthdate,
+            # a new dict (and name slugs list) on each call, the result
+            # may be cached and shared with other callers
+            "birthplace": self._birthplace_data.to_dict(),
+            "firstname_options": list(self.firstname_options),
+            "raw": self.raw.copy(),
+        }
+
+
+def _get_birthdate_parts(
+    raw: dict[str, str],
+    current_year: int,
+) -> tuple[int, int, int, Literal["M", "F"]] | None:
+    birthdate_year_code = raw["birthdate_year"].translate(_OMOCODIA_DECODE_TRANS)
+    birthdate_day_code = raw["birthdate_day"].translate(_OMOCODIA_DECODE_TRANS)
+    if not birthdate_year_code.isdigit() or not birthdate_day_code.isdigit():
+        return None
+
+    birthdate_year = int(birthdate_year_code)
     birthdate_month = _MONTHS.index(raw["birthdate_month"]) + 1
-    birthdate_day = int(raw["birthdate_day"].translate(_OMOCODIA_DECODE_TRANS))
+    birthdate_day = int(birthdate_day_code)
 
     gender: Literal["M", "F"] = "M"
     if birthdate_day > 40:
         birthdate_day -= 40
         gender = "F"
 
-    current_year = datetime.now().year
     current_year_century_prefix = str(current_year)[0:-2]
     birthdate_year_suffix = str(birthdate_year).zfill(2)
     birthdate_year = int(f"{current_year_century_prefix}{birthdate_year_suffix}")
     if birthdate_year > current_year:
         birthdate_year -= 100
 
-    birthdate_or_birthplace_error = None
-    for _ in range(2):
-        birthdate_str = f"{birthdate_year}/{birthdate_month}/{birthdate_day}"
-        try:
-            birthdate = _get_date(birthdate_str, separator="/")
-            if not birthdate:
-                raise ValueError(f"[codicefiscale] invalid date: {birthdate_str}")
+    return (birthdate_year, birthdate_month, birthdate_day, gender)
+
+
+def _get_birthplace_code(raw: dict[str, str]) -> str:
+    return raw["birthplace"][0] + raw["birthplace"][1:].translate(
+        _OMOCODIA_DECODE_TRANS
+    )
+
+
+def _get_birthplace_code_index(raw: dict[str, str]) -> int | None:
+    # same as get_birthplace_code_index(_get_birthplace_code(raw)),
+    # the raw code syntax allows any letter in the birthplace digits,
+    # letters that are not omocodia letters don't map to any code
+    birthplace = raw["birthplace"]
+    digits = _BIRTHPLACE_DIGITS
+    hundreds = digits.get(birthplace[1])
+    tens = digits.get(birthplace[2])
+    units = digits.get(birthplace[3])
+    if hundreds is None or tens is None or units is None:
+        return None
+    return (ord(birthplace[0]) - 65) * 1000 + hundreds * 100 + tens * 10 + units
+
+
+def _is_valid_date(year: int, month: int, day: int) -> bool:
+    month_days = _MONTHS_DAYS[month - 1]
+    if month == 2 and year % 4 == 0 and (year % 100 != 0 or year % 400 == 0):
+        month_days = 29
+    return 1 <= day <= month_days
+
 
-            birthplace_code = raw["birthplace"][0] + raw["birthplace"][1:].translate(
-                _OMOCODIA_DECODE_TRANS
+def _is_valid_birthdate(
+    raw: dict[str, str],
+    current_year: int,
+) -> bool:
+    birthdate_parts = _get_birthdate_parts(raw, current_year)
+    if not birthdate_parts:
+        return False
+    birthdate_year, birthdate_month, birthdate_day, _ = birthdate_parts
+    # attempt to handle people over 100 years old
+    return _is_valid_date(
+        birthdate_year, birthdate_month, birthdate_day
+    ) or _is_valid_date(birthdate_year - 100, birthdate_month, birthdate_day)
+
+
+def _get_birthplace_error_reason(code_index: int) -> ErrorReason:
+    # the code exists, but no birthplace was active at the birthdate
+    if _get_data()["codes"][code_index] is not None:
+        return ErrorReason.BIRTHPLACE_DATE
+    return ErrorReason.BIRTHPLACE
+
+
+def _decode(
+    raw: dict[str, str],
+    current_year: int,
+    get_birthplace: Callable[[int, datetime], Birthplace | None] = (
+        _get_birthplace_by_code_index
+    ),
+) -> DecodeResult | ErrorReason:
+    # errors are returned instead of being raised,
+    # building and unwinding exceptions is slow on bulk invalid codes
+    code = raw["code"]
+
+    birthdate_parts = _get_birthdate_parts(raw, current_year)
+    if not birthdate_parts:
+        return ErrorReason.DATE
+    birthdate_year, birthdate_month, birthdate_day, gender = birthdate_parts
+    birthplace_code_index = _get_birthplace_code_index(raw)
+    if birthplace_code_index is None:
+        return ErrorReason.BIRTHPLACE
+
+    birthdate_or_birthplace_error = None
+    out_of_profile = False
+    # attempt to handle people over 100 years old
+    for year in [birthdate_year, birthdate_year - 100]:
+        if not _is_valid_date(year, birthdate_month, birthdate_day):
+            birthdate_or_birthplace_error = (
+                birthdate_or_birthplace_error or ErrorReason.DATE
             )
-            birthplace = _get_birthplace(birthplace_code, birthdate)
-            # print(birthplace)
-            if not birthplace:
-                raise ValueError(
-                    "[codicefiscale] wrong birthplace code: "
-                    f"{birthplace_code!r} / birthdate: {birthdate.isoformat()!r}."
+            continue
+        birthdate = datetime(year, birthdate_month, birthdate_day)
+        if _is_out_of_profile(birthdate):
+            # the profile keeps all the codes, a code that doesn't exist
+            # is a wrong birthplace at any birthdate, as in the full data
+            birthplace_error = _get_birthplace_error_reason(birthplace_code_index)
+            if birthplace_error == ErrorReason.BIRTHPLACE:
+                birthdate_or_birthplace_error = (
+                    birthdate_or_birthplace_error or birthplace_error
                 )
-            break
-        except ValueError as error:
-            # attempt to handle people over 100 years old
-            if birthdate_or_birthplace_error is None:
-                birthdate_or_birthplace_error = error
-            birthdate_year -= 100
+            else:
+                out_of_profile = True
+            continue
+        birthplace = get_birthplace(birthplace_code_index, birthdate)
+        if not birthplace:
+            birthdate_or_birthplace_error = (
+                birthdate_or_birthplace_error
+                or _get_birthplace_error_reason(birthplace_code_index)
+            )
+            continue
+        break
     else:
-        # raise the first raised error
-        if birthdate_or_birthplace_error:
-            raise birthdate_or_birthplace_error
-
-    cin = raw["cin"]
-    cin_check = encode_cin(code)
-    # print(cin, cin_check)
-    if cin != cin_check:
-        raise ValueError(
+        # the code exists and could be valid at the out of profile
+        # birthdate using the full data, otherwise return the first error
+        if out_of_profile:
+            return ErrorReason.OUT_OF_PROFILE
+        return cast(ErrorReason, birthdate_or_birthplace_error)
+
+    if raw["cin"] != encode_cin(code):
+        return ErrorReason.CIN
+
+    return DecodeResult(
+        code=code,
+        gender=gender,
+        birthdate=birthdate,
+        birthplace=birthplace,
+        raw=raw,
+    )
+
+
+def _get_syntax_error(code: str) -> DecodeError:
+    return DecodeError(
+        f"[codicefiscale] invalid syntax: {code}",
+        reason=ErrorReason.SYNTAX,
+    )
+
+
+def _get_decode_error(
+    raw: dict[str, str],
+    reason: ErrorReason,
+    current_year: int,
+) -> DecodeError:
+    message = f"[codicefiscale] invalid code: {raw['code']}"
+    birthdate_parts = _get_birthdate_parts(raw, current_year)
+    if reason == ErrorReason.DATE:
+        message = f"[codicefiscale] invalid date: {raw['birthdate']}"
+        if birthdate_parts:
+            birthdate_year, birthdate_month, birthdate_day, _ = birthdate_parts
+            message = (
+                "[codicefiscale] invalid date: "
+                f"{birthdate_year}/{birthdate_month}/{birthdate_day}"
+            )
+    elif reason in (ErrorReason.BIRTHPLACE, ErrorReason.BIRTHPLACE_DATE):
+        birthplace_code = _get_birthplace_code(raw)
+        birthdate_year, birthdate_month, birthdate_day, _ = cast(
+            tuple[int, int, int, str], birthdate_parts
+        )
+        birthdate = datetime(birthdate_year, birthdate_month, birthdate_day)
+        message = (
+            "[codicefiscale] wrong birthplace code: "
+            f"{birthplace_code!r} / birthdate: {birthdate.isoformat()!r}."
+        )
+    elif reason == ErrorReason.OUT_OF_PROFILE:
+        birthdate_year, birthdate_month, birthdate_day, _ = cast(
+            tuple[int, int, int, str], birthdate_parts
+        )
+        # report the candidate birthdate that is out of profile
+        for year in [birthdate_year, birthdate_year - 100]:
+            if _is_valid_date(year, birthdate_month, birthdate_day) and (
+                _is_out_of_profile(datetime(year, birthdate_month, birthdate_day))
+            ):
+                birthdate_year = year
+                break
+        message = (
+            "[codicefiscale] birthdate out of data profile "
+            f"{get_data_profile()!r}: "
+            f"{birthdate_year}/{birthdate_month}/{birthdate_day}"
+        )
+    elif reason == ErrorReason.CIN:
+        cin = raw["cin"]
+        cin_check = encode_cin(raw["code"])
+        message = (
             "[codicefiscale] wrong CIN (Control Internal Number): "
             f"expected {cin_check!r}, found {cin!r}"
         )
+    return DecodeError(message, reason=reason)
 
-    # add possible first names if birthplace is in Italy (not foreign country)
-    firstname_options = None
-    is_foreign = birthplace and birthplace.get("province") == "EE"
-    if not is_foreign:
-        firstname_options = decode_firstname(raw["firstname"], gender)
 
-    data = {
-        "code": code,
-        "omocodes": _get_omocodes(code),
-        "gender": gender,
-        "birthdate": birthdate,
-        "birthplace": birthplace,
-        "firstname_options": firstname_options or [],
-        "raw": raw,
-    }
+def _decode_code(
+    code: str | bytes | bytearray | memoryview,
+    current_year: int,
+    get_birthplace: Callable[[int, datetime], Birthplace | None] = (
+        _get_birthplace_by_code_index
+    ),
+) -> DecodeResult | DecodeError:
+    try:
+        code = _normalize_code(code)
+    except TypeError:
+        # eg. None items of a batch, don't stop the whole batch
+        return _get_syntax_error(repr(code))
+    raw = _get_raw(code)
+    if raw is None:
+        return _get_syntax_error(code)
+    result = _decode(raw, current_year, get_birthplace)
+    if isinstance(result, ErrorReason):
+        return _get_decode_error(raw, result, current_year)
+    return result
+
+
+def _get_code_error(
+    code: str,
+    reason: ErrorReason,
+    current_year: int,
+) -> DecodeError:
+    raw = _get_raw(code)
+    if raw is None:
+        return _get_syntax_error(code)
+    return _get_decode_error(raw, reason, current_year)
 
-    # print(data)
-    return data
 
+def _decode_normalized(
+    code: str,
+    current_year: int,
+    cache: LRUCache[tuple[str, int], DecodeResult | ErrorReason] | None,
+) -> DecodeResult | ErrorReason:
+    if cache is not None:
+        key = (code, current_year)
+        result = cache.get(key, None)
+        if result is None:
+            result = _decode_normalized(code, current_year, None)
+            cache.set(key, result)
+        return result
+    raw = _get_raw(code)
+    if raw is None:
+        return ErrorReason.SYNTAX
+    return _decode(raw, current_year)
+
+
+@overload
+def decode(
+    code: str | bytes | bytearray | memoryview,
+    lazy: Literal[False] = False,
+    *,
+    reference_date: date_type | None = None,
+) -> dict[str, Any]: ...
+
+
+@overload
+def decode(
+    code: str | bytes | bytearray | memoryview,
+    lazy: Literal[True],
+    *,
+    reference_date: date_type | None = None,
+) -> DecodeResult: ...
+
+
+@overload
+def decode(
+    code: str | bytes | bytearray | memoryview,
+    lazy: bool = False,
+    *,
+    reference_date: date_type | None = None,
+) -> dict[str, Any] | DecodeResult: ...
+
+
+def decode(
+    code: str | bytes | bytearray | memoryview,
+    lazy: bool = False,
+    *,
+    reference_date: date_type | None = None,
+) -> dict[str, Any] | DecodeResult:
+    """
+    Decodes the italian fiscal code.
+
+    :param code: The code
+    :type code: string or bytes-like
+    :param lazy: If True, returns a DecodeResult that computes the most
+        expensive values (eg. omocodes) only when accessed
+    :type lazy: bool
+    :param reference_date: The date used to resolve the birthdate century,
+        if None the `get_reference_date` value is used
+    :type reference_date: date or None
+
+    :returns: The data associated to the code and some additional info.
+    :rtype: dict or DecodeResult
+
+    :raises DecodeError: If the code is not valid (ValueError subclass)
+    """
+    code = _normalize_code(code)
+    current_year = _get_current_year(reference_date)
+    cache = _DECODE_CACHE
+    result = _decode_normalized(code, current_year, cache)
+    if isinstance(result, ErrorReason):
+        raise _get_code_error(code, result, current_year)
+    if lazy:
+        # cached results are shared and must not be modified by the caller
+        return result if cache is None else result._copy()
+    return result.to_dict()
+
+
+@overload
+def iter_decode(
+    codes: Iterable[str | bytes | bytearray | memoryview],
+    lazy: Literal[False] = False,
+    *,
+    reference_date: date_type | None = None,
+) -> Iterator[dict[str, Any] | DecodeError]: ...
+
+
+@overload
+def iter_decode(
+    codes: Iterable[str | bytes | bytearray | memoryview],
+    lazy: Literal[True],
+    *,
+    reference_date: date_type | None = None,
+) -> Iterator[DecodeResult | DecodeError]: ...
+
+
+@overload
+def iter_decode(
+    codes: Iterable[str | bytes | bytearray | memoryview],
+    lazy: bool = False,
+    *,
+    reference_date: date_type | None = None,
+) -> Iterator[dict[str, Any] | DecodeResult | DecodeError]: ...
+
+
+def iter_decode(
+    codes: Iterable[str | bytes | bytearray | memoryview],
+    lazy: bool = False,
+    *,
+    reference_date: date_type | None = None,
+) -> Iterator[dict[str, Any] | DecodeResult | DecodeError]:
+    """
+    Decodes many italian fiscal codes lazily, one at a time.
+
+    Invalid codes don't stop the iteration, the DecodeError that would
+    be raised by `decode` is yielded in place of the decoded data,
+    items that are not strings or bytes-like are yielded as syntax errors.
+
+    :param codes: The codes
+    :type codes: iterable of strings or bytes-like
+    :param lazy: If True, yields DecodeResult objects (see `decode`)
+    :type lazy: bool
+    :param reference_date: The date used to resolve the birthdate century
+        (see `decode`)
+    :type reference_date: date or None
+
+    :returns: The data associated to each code or the error.
+    :rtype: iterator of dict, DecodeResult or DecodeError
+    """
+    # the century pivot is computed once and is the same for the whole batch
+    current_year = _get_current_year(reference_date)
+
+    # resolve each distinct (birthplace code, birthdate) only once per batch
+    birthplaces: dict[tuple[int, datetime], Birthplace | None] = {}
+
+    def get_birthplace(
+        birthplace_code_index: int,
+        birthdate: datetime,
+    ) -> Birthplace | None:
+        key = (birthplace_code_index, birthdate)
+        if key in birthplaces:
+            return birthplaces[key]
+        if len(birthplaces) >= _BATCH_BIRTHPLACES_MAXSIZE:
+            birthplaces.clear()
+        birthplace = _get_birthplace_by_code_index(birthplace_code_index, birthdate)
+        birthplaces[key] = birthplace
+        return birthplace
+
+    for code in codes:
+        result = _decode_code(
+            code,
+            current_year=current_year,
+            get_birthplace=get_birthplace,
+        )
+        if lazy or isinstance(result, DecodeError):
+            yield result
+        else:
+            yield result.to_dict()
+
+
+@overload
+def decode_many(
+    codes: Iterable[str | bytes | bytearray | memoryview],
+    lazy: Literal[False] = False,
+    *,
+    reference_date: date_type | None = None,
+) -> list[dict[str, Any] | DecodeError]: ...
+
+
+@overload
+def decode_many(
+    codes: Iterable[str | bytes | bytearray | memoryview],
+    lazy: Literal[True],
+    *,
+    reference_date: date_type | None = None,
+) -> list[DecodeResult | DecodeError]: ...
+
+
+@overload
+def decode_many(
+    codes: Iterable[str | bytes | bytearray | memoryview],
+    lazy: bool = False,
+    *,
+    reference_date: date_type | None = None,
+) -> list[dict[str, Any] | DecodeResult | DecodeError]: ...
+
+
+def decode_many(
+    codes: Iterable[str | bytes | bytearray | memoryview],
+    lazy: bool = False,
+    *,
+    reference_date: date_type | None = None,
+) -> list[Any]:
+    """
+    Decodes many italian fiscal codes.
+
+    Invalid codes don't raise, the DecodeError that would be raised
+    by `decode` is returned in place of the decoded data.
 
-def is_omocode(code: str) -> bool:
+    :param codes: The codes
+    :type codes: iterable of strings or bytes-like
+    :param lazy: If True, returns DecodeResult objects (see `decode`)
+    :type lazy: bool
+    :param reference_date: The date used to resolve the birthdate century
+        (see `decode`)
+    :type reference_date: date or None
+
+    :returns: The data associated to each code or the error, in the same order.
+    :rtype: list of dict, DecodeResult or DecodeError
+    """
+    if lazy:
+        return list(iter_decode(codes, lazy=True, reference_date=reference_date))
+    return list(iter_decode(codes, reference_date=reference_date))
+
+
+def _decode_raw_checksum(
+    code: str | bytes | bytearray | memoryview,
+) -> dict[str, str]:
+    raw = decode_raw(code)
+    if encode_cin(raw["code"]) != raw["cin"]:
+        raise _get_decode_error(raw, ErrorReason.CIN, _get_current_year(None))
+    return raw
+
+
+def canonical_code(code: str | bytes | bytearray | memoryview) -> str:
+    """
+    Gets the canonical (base) code of the specified code.
+
+    All the omocodes of a code have the same canonical code,
+    so it can be used as dedup / join key.
+    Only the syntax and the CIN of the code are checked.
+
+    :param code: The code
+    :type code: string or bytes-like
+
+    :returns: The canonical code, the code itself if it is not omocode.
+    :rtype: string
+
+    :raises DecodeError: If the code syntax or CIN is not valid
+    """
+    raw = _decode_raw_checksum(code)
+    code_root = _get_code_root(raw["code"])
+    return f"{code_root}{encode_cin(code_root)}"
+
+
+def is_omocode(code: str | bytes | bytearray | memoryview) -> bool:
     """
     Determines whether the specified code is omocode or not.
 
+    Only the syntax and the CIN of the code are checked.
+
     :param code: The code
-    :type code: string
+    :type code: string or bytes-like
 
     :returns: True if the specified code is omocode, False otherwise.
     :rtype: boolean
+
+    :raises DecodeError: If the code syntax or CIN is not valid
+    """
+    raw = _decode_raw_checksum(code)
+    code = raw["code"]
+    return _get_code_root(code) != code[0:15]
+
+
+def _check_validation_level(level: str) -> None:
+    if level not in _VALIDATION_LEVELS:
+        raise ValueError(
+            f"[codicefiscale] 'level' argument must be one of "
+            f"{_VALIDATION_LEVELS!r}, not: {level!r}"
+        )
+
+
+def _get_error_reason(
+    code: str | bytes | bytearray | memoryview,
+    level: str,
+    current_year: int,
+) -> ErrorReason | None:
+    code = _normalize_code(code)
+    if level == "full":
+        # same checks (and errors order) of decode
+        result = _decode_normalized(code, current_year, _DECODE_CACHE)
+        return result if isinstance(result, ErrorReason) else None
+    raw = _get_raw(code)
+    if raw is None:
+        return ErrorReason.SYNTAX
+    if level == "syntax":
+        return None
+    if encode_cin(raw["code"]) != raw["cin"]:
+        return ErrorReason.CIN
+    if level == "checksum":
+        return None
+    if not _is_valid_birthdate(raw, current_year):
+        return ErrorReason.DATE
+    return None
+
+
+def get_error_reason(
+    code: str | bytes | bytearray | memoryview,
+    level: Literal["syntax", "checksum", "date", "full"] = "full",
+    *,
+    reference_date: date_type | None = None,
+) -> ErrorReason | None:
     """
-    data = decode(code)
-    codes = data["omocodes"]
-    codes.pop(0)
-    return code in codes
+    Gets the reason why the specified code is not valid, without raising.
 
+    :param code: The code
+    :type code: string or bytes-like
+    :param level: The validation level (see `is_valid`)
+    :type level: string
+    :param reference_date: The date used to resolve the birthdate century
+        (see `decode`)
+    :type reference_date: date or None
+
+    :returns: The ErrorReason if the code is not valid, None otherwise.
+    :rtype: ErrorReason or None
+    """
+    _check_validation_level(level)
+    return _get_error_reason(
+        code, level, current_year=_get_current_year(reference_date)
+    )
 
-def is_valid(code: str) -> bool:
+
+def is_valid(
+    code: str | bytes | bytearray | memoryview,
+    level: Literal["syntax", "checksum", "date", "full"] = "full",
+    *,
+    reference_date: date_type | None = None,
+) -> bool:
     """
     Determines whether the specified code is valid.
 
+    Cheaper validation levels check only part of the code
+    and don't need to load the municipalities / countries data:
+
+    - 'syntax': the code structure
+    - 'checksum': the code structure and the CIN
+    - 'date': the code structure, the CIN and the birthdate
+    - 'full': the whole code, including the birthplace (default)
+
     :param code: The code
-    :type code: string
+    :type code: string or bytes-like
+    :param level: The validation level
+    :type level: string
+    :param reference_date: The date used to resolve the birthdate century
+        (see `decode`)
+    :type reference_date: date or None
 
     :returns: True if the specified code is valid, False otherwise.
     :rtype: boolean
     """
-    try:
-        decode(code)
-        return True
-    except ValueError:
-        return False
+    _check_validation_level(level)
+    reason = _get_error_reason(
+        code, level, current_year=_get_current_year(reference_date)
+    )
+    return reason is None
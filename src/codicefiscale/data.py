@@ -1,11 +1,287 @@
 from __future__ import annotations
 
+import functools
+import gc
 import os
+import stat
 import sys
-from typing import Any
+import threading
+from bisect import bisect_right
+from collections.abc import Iterator, Mapping
+from datetime import date
+from typing import Any, NamedTuple
 
-import fsutil
-from slugify import slugify
+from codicefiscale.metadata import __version__
+from codicefiscale.slug import get_slug
+
+# bump this value whenever the structure of the indexed data changes,
+# so that snapshots written by a previous implementation are discarded
+INDEXED_DATA_FORMAT: int = 6
+
+# birthplace (belfiore) codes are one letter and three digits, eg. 'L219',
+# the codes index is a flat list addressed by: letter * 1000 + digits
+BIRTHPLACE_CODES_COUNT: int = 26 * 1000
+
+# each table of the indexed data is built (or read from its snapshot)
+# independently on first access, only from the data files it depends on
+INDEXED_DATA_TABLES: dict[str, list[str]] = {
+    "municipalities": [
+        "municipalities.json",
+    ],
+    "countries": [
+        "countries.json",
+        "deleted-countries.json",
+    ],
+    "codes": [
+        "municipalities.json",
+        "countries.json",
+        "deleted-countries.json",
+    ],
+    "names": [
+        "names.json",
+        "names-index.json",
+    ],
+}
+
+# the data profile can be selected using this environment variable
+DATA_PROFILE_ENV: str = "CODICEFISCALE_DATA_PROFILE"
+
+
+class DataProfile(NamedTuple):
+    """
+    The subset of the data loaded, parsed from the profile name:
+
+    - 'full': all the data (default)
+    - 'since:YEAR': only the birthplaces for birthdates since the given year
+    - 'codes-only': only the birthplace codes, without the alternative names,
+      birthplaces can't be looked up by name
+    """
+
+    name: str = "full"
+    since: date | None = None
+    codes_only: bool = False
+
+    @property
+    def id(self) -> str:
+        # used in snapshot filenames
+        return self.name.replace(":", "-")
+
+
+def parse_data_profile(name: str | None = None) -> DataProfile:
+    if name is None:
+        name = os.environ.get(DATA_PROFILE_ENV) or "full"
+    name = name.strip().lower()
+    if name == "full":
+        return DataProfile()
+    if name == "codes-only":
+        return DataProfile(name=name, codes_only=True)
+    if name.startswith("since:"):
+        year = name[6:]
+        if year.isascii() and year.isdigit() and 1 <= int(year) <= 9999:
+            return DataProfile(name=f"since:{int(year)}", since=date(int(year), 1, 1))
+    raise ValueError(
+        "[codicefiscale] invalid data profile, expected 'full', "
+        f"'since:YEAR' or 'codes-only', not: {name!r}"
+    )
+
+
+class Birthplace(NamedTuple):
+    """
+    Compact and immutable record of a municipality or a foreign country.
+
+    Dates are parsed once, province codes and slugs are interned, so that
+    the same string objects are shared by all the records and index keys.
+    """
+
+    code: str
+    name: str
+    province: str
+    active: bool
+    date_created: date | None
+    date_deleted: date | None
+    name_slugs: tuple[str, ...]
+    name_alt: str = ""
+    # municipalities only
+    name_trans: str | None = None
+    name_alt_trans: str | None = None
+    # countries only
+    name_alt_en: str | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Birthplace:
+        return cls(
+            code=sys.intern(data["code"]),
+            name=data["name"],
+            province=sys.intern(data["province"]),
+            active=bool(data["active"]),
+            date_created=_get_date(data["date_created"]),
+            date_deleted=_get_date(data["date_deleted"]),
+            name_slugs=tuple(sys.intern(slug) for slug in data["name_slugs"]),
+            name_alt=data.get("name_alt", ""),
+            name_trans=data.get("name_trans"),
+            name_alt_trans=data.get("name_alt_trans"),
+            name_alt_en=data.get("name_alt_en"),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Gets the record as a new dict, the same stored in the data files.
+
+        :returns: The birthplace data
+        :rtype: dict
+        """
+        data: dict[str, Any] = {
+            "active": self.active,
+            "code": self.code,
+            "date_created": _get_date_isoformat(self.date_created),
+            "date_deleted": _get_date_isoformat(self.date_deleted),
+            "name": self.name,
+            "name_alt": self.name_alt,
+        }
+        if self.name_alt_en is not None:
+            data["name_alt_en"] = self.name_alt_en
+        if self.name_alt_trans is not None:
+            data["name_alt_trans"] = self.name_alt_trans
+        data["name_slugs"] = list(self.name_slugs)
+        if self.name_trans is not None:
+            data["name_trans"] = self.name_trans
+        data["province"] = self.province
+        return data
+
+
+class BirthplaceIntervals:
+    """
+    Date-aware index of the birthplaces sharing the same name or code.
+
+    The created / deleted dates of all the options are parsed once and
+    the option to return for every date-range between them is decided
+    in advance, so that a lookup is a bisection over the date ordinals.
+    """
+
+    __slots__ = ("options", "_bounds", "_indexes")
+
+    def __init__(self, options: list[Birthplace]) -> None:
+        self.options = options
+        dates_created = [_get_date_ordinal(opt.date_created) for opt in options]
+        dates_deleted = [_get_date_ordinal(opt.date_deleted) for opt in options]
+        dates = sorted(
+            {value for value in dates_created + dates_deleted if value is not None}
+        )
+        # date ordinals are doubled to represent both the exact dates (even)
+        # and the date-ranges between two consecutive dates (odd)
+        bounds: list[int] = []
+        indexes = [
+            _get_birthplace_option_index(
+                dates_created, dates_deleted, (dates[0] - 1) if dates else 0
+            )
+        ]
+        for date_index, date_value in enumerate(dates):
+            date_next = dates[date_index + 1] if date_index + 1 < len(dates) else None
+            ranges = [(date_value * 2, date_value)]
+            if date_next is None or date_value + 1 < date_next:
+                ranges.append((date_value * 2 + 1, date_value + 1))
+            for bound, ordinal in ranges:
+                index = _get_birthplace_option_index(
+                    dates_created, dates_deleted, ordinal
+                )
+                if index != indexes[-1]:
+                    bounds.append(bound)
+                    indexes.append(index)
+        self._bounds = bounds
+        self._indexes = indexes
+
+    def get(self, birthdate: date | None = None) -> Birthplace | None:
+        if birthdate is None:
+            return self.options[0] if self.options else None
+        bound = birthdate.toordinal() * 2
+        index = self._indexes[bisect_right(self._bounds, bound)]
+        return self.options[index] if index >= 0 else None
+
+    def get_since(self, start: date) -> BirthplaceIntervals:
+        """
+        Gets the same intervals index restricted to the birthdates since
+        the start date, options not returned for these dates are removed.
+        """
+        # the lookup of a date since the start date can't return an option
+        # before the start position, its result is not changed
+        start_position = bisect_right(self._bounds, start.toordinal() * 2)
+        indexes = self._indexes[start_position:]
+        options_indexes = sorted({index for index in indexes if index >= 0})
+        options_map = {index: value for value, index in enumerate(options_indexes)}
+        intervals = object.__new__(BirthplaceIntervals)
+        intervals.options = [self.options[index] for index in options_indexes]
+        intervals._bounds = self._bounds[start_position:]
+        intervals._indexes = [options_map.get(index, -1) for index in indexes]
+        return intervals
+
+
+@functools.cache
+def _get_date(value: str) -> date | None:
+    # dates are stored as iso strings, eg. '1985-04-03T00:00:00',
+    # cached to share the same date object between all the records
+    return date.fromisoformat(value[:10]) if value else None
+
+
+def _get_date_isoformat(value: date | None) -> str:
+    return f"{value.isoformat()}T00:00:00" if value else ""
+
+
+def _get_date_ordinal(value: date | None) -> int | None:
+    return value.toordinal() if value else None
+
+
+def _get_birthplace_option_index(
+    dates_created: list[int | None],
+    dates_deleted: list[int | None],
+    birthdate: int,
+) -> int:
+    options_count = len(dates_created)
+
+    # search birthplace that has been created before / deleted after birthdate
+    for index in range(options_count):
+        date_created = dates_created[index]
+        date_deleted = dates_deleted[index]
+        if (date_created is None or birthdate >= date_created) and (
+            date_deleted is None or birthdate <= date_deleted
+        ):
+            return index
+
+    # avoid wrong birthplace code error when birthdate falls in
+    # missing date-range in the data-source even if birthplace code is valid
+    for index in range(options_count - 1):
+        date_deleted = dates_deleted[index]
+        date_created = dates_created[index + 1]
+        if date_deleted is not None and date_created is not None:
+            if birthdate >= date_deleted and date_deleted <= date_created:
+                # the birthdate is in between a deleted munipality and a created one
+                # if the deleted one has a very short active time delta,
+                # it means that probably the deleted_at value is wrong
+                date_created = dates_created[index]
+                if date_created is not None and date_deleted - date_created <= 1:
+                    return index
+                return index + 1
+
+    # Fix issues #210, #213
+    # sometimes the code has been assigned after date of birth and
+    # the municipality was not yet active at birthdate time,
+    # let's return the first municipality created after birthdate
+    for index in range(options_count):
+        date_created = dates_created[index]
+        if date_created is not None and birthdate <= date_created:
+            return index
+    return -1
+
+
+def get_birthplace_code_index(code: str) -> int | None:
+    # eg. 'A001' -> 1, 'L219' -> 11219, 'Z330' -> 25330
+    if (
+        len(code) == 4
+        and "A" <= code[0] <= "Z"
+        and code[1:].isascii()
+        and code[1:].isdigit()
+    ):
+        return (ord(code[0]) - 65) * 1000 + int(code[1:])
+    return None
 
 
 def get_data_basedir() -> str:
@@ -15,10 +291,31 @@ def get_data_basedir() -> str:
     return __file__
 
 
+def get_data_filepath(filename: str) -> str:
+    # fsutil is not used here, this is called also when the indexed data
+    # is read from the snapshot (to get its key) and fsutil is slow to import
+    data_basedir = get_data_basedir()
+    if data_basedir.endswith((".py", ".pyc", ".pyo")):
+        data_basedir = os.path.dirname(os.path.realpath(data_basedir))
+    return os.path.normpath(os.path.join(data_basedir, "data", filename))
+
+
 def get_data(filename: str) -> Any:
-    return fsutil.read_file_json(
-        fsutil.join_path(get_data_basedir(), f"data/{filename}")
+    import fsutil
+
+    return fsutil.read_file_json(get_data_filepath(filename))
+
+
+def get_cache_dir() -> str | None:
+    # the snapshot of the indexed data can be disabled
+    # by setting the environment variable to an empty string
+    cache_dir = os.environ.get("CODICEFISCALE_CACHE_DIR")
+    if cache_dir is not None:
+        return cache_dir or None
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
     )
+    return os.path.join(cache_home, "codicefiscale")
 
 
 def get_municipalities_data() -> Any:
@@ -37,51 +334,359 @@ def get_names_data() -> Any:
     return names
 
 
-def get_indexed_data() -> dict[str, Any]:
-    from codicefiscale.codicefiscale import encode_firstname
+def get_names_index_data() -> Any:
+    # the index is precomputed by scripts/updatedata.py,
+    # it is built from the names data if the file is missing
+    if os.path.exists(get_data_filepath("names-index.json")):
+        return get_data("names-index.json")
+    return build_names_index(get_names_data())
 
-    municipalities = get_municipalities_data()
-    countries = get_countries_data()
-    names = get_names_data()
 
-    data: dict[str, Any] = {
-        "municipalities": {},
-        "countries": {},
-        "codes": {},
-        "names": {},
-    }
+def get_municipality_name_keys(municipality: dict[str, Any]) -> list[str]:
+    province = municipality["province"].lower()
+    municipality_unicode_slug = get_slug(municipality["name"], allow_unicode=True)
+    municipality_names = [municipality_unicode_slug] + municipality["name_slugs"]
+    # repeated keys are not removed, the municipality is listed once per key
+    # in the index and the birthplace intervals depend on the repeated options
+    name_keys: list[str] = []
+    for name in municipality_names:
+        name_and_province = f"{name}-{province}"
+        name_keys += [name, name_and_province]
+    return name_keys
+
 
-    for municipality in municipalities:
-        code = municipality["code"]
-        province = municipality["province"].lower()
-        municipality_unicode_slug = slugify(municipality["name"], allow_unicode=True)
-        municipality_names = [municipality_unicode_slug] + municipality["name_slugs"]
-        for name in municipality_names:
-            name_and_province = f"{name}-{province}"
-            data["municipalities"].setdefault(name, [])
-            data["municipalities"].setdefault(name_and_province, [])
-            data["municipalities"][name].append(municipality)
-            data["municipalities"][name_and_province].append(municipality)
-        data["codes"].setdefault(code, [])
-        data["codes"][code].append(municipality)
-
-    for country in countries:
-        code = country["code"]
-        country_names = country["name_slugs"]
-        for name in country_names:
-            data["countries"].setdefault(name, [])
-            data["countries"][name].append(country)
-        data["codes"].setdefault(code, [])
-        data["codes"][code].append(country)
+def build_names_index(names: dict[str, list[str]]) -> dict[str, dict[str, list[str]]]:
+    from codicefiscale.codicefiscale import encode_firstname
 
+    names_index: dict[str, dict[str, set[str]]] = {}
     for gender, gender_names in names.items():
         for name in gender_names:
             code = encode_firstname(name)
-            data["names"].setdefault(code, {"M": set(), "F": set()})
-            data["names"][code][gender].add(name)
+            names_index.setdefault(code, {"M": set(), "F": set()})
+            names_index[code][gender].add(name)
+    return {
+        code: {gender: sorted(names_set) for gender, names_set in code_names.items()}
+        for code, code_names in names_index.items()
+    }
+
+
+def get_indexed_data_cache_key(
+    table: str,
+    profile: DataProfile | None = None,
+) -> str:
+    import hashlib
+
+    profile = profile or DataProfile()
+    key = hashlib.sha256()
+    key.update(f"{__version__}:{INDEXED_DATA_FORMAT}:{table}:{profile.name}".encode())
+    for filename in INDEXED_DATA_TABLES[table]:
+        try:
+            filestat = os.stat(get_data_filepath(filename))
+        except FileNotFoundError:
+            # optional precomputed data file
+            key.update(f":{filename}:".encode())
+            continue
+        key.update(f":{filename}:{filestat.st_size}:{filestat.st_mtime_ns}".encode())
+    return key.hexdigest()[:16]
+
+
+def get_indexed_data_cache_filepath(
+    table: str,
+    profile: DataProfile | None = None,
+) -> str | None:
+    cache_dir = get_cache_dir()
+    if not cache_dir:
+        return None
+    profile = profile or DataProfile()
+    cache_key = get_indexed_data_cache_key(table, profile)
+    return os.path.join(
+        cache_dir,
+        f"indexed-data-{__version__}-{cache_key}.{profile.id}.{table}.pickle",
+    )
+
+
+def read_indexed_data_cache(filepath: str) -> dict[str, Any] | None:
+    import pickle
+
+    # the garbage collector would repeatedly scan the many objects
+    # allocated while unpickling, it makes loading much slower
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        with open(filepath, "rb") as file:
+            # the checked file is the opened one, it can't be swapped
+            if not _is_trusted_cache_file(os.fstat(file.fileno())):
+                return None
+            data = pickle.load(file)
+    except Exception:
+        # missing, unreadable or incompatible snapshot
+        return None
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return data if isinstance(data, dict) else None
+
+
+def _is_trusted_cache_file(filestat: os.stat_result) -> bool:
+    # unpickling runs arbitrary code, snapshots planted in a shared
+    # or writable cache dir by other users must never be loaded
+    if not hasattr(os, "getuid"):
+        # no file owners / permission bits (eg. Windows)
+        return True
+    if filestat.st_uid != os.getuid():
+        return False
+    return not filestat.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+
+def write_indexed_data_cache(filepath: str, data: dict[str, Any]) -> None:
+    import pickle
+    import tempfile
+
+    cache_dir = os.path.dirname(filepath)
+    # snapshots of the other tables / profiles / versions are kept,
+    # the cache dir can be shared by environments with other versions
+    cache_filename = os.path.basename(filepath)
+    cache_filename_prefix = f"indexed-data-{__version__}-"
+    cache_filename_suffix = "." + ".".join(cache_filename.rsplit(".", 3)[1:])
+    try:
+        # the cache dir is private when created, the snapshots written
+        # by mkstemp are readable and writable only by the current user
+        os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+        # write to a temporary file and move it in place atomically,
+        # concurrent processes must never read a partially written snapshot
+        fd, temp_filepath = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                pickle.dump(data, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_filepath, filepath)
+        except BaseException:
+            os.remove(temp_filepath)
+            raise
+        # remove stale snapshots of the same table / profile written
+        # by this version with other data files, a snapshot written
+        # meanwhile by a concurrent process is not older and is kept
+        cache_mtime_ns = os.stat(filepath).st_mtime_ns
+        for filename in os.listdir(cache_dir):
+            stale_filepath = os.path.join(cache_dir, filename)
+            if (
+                not filename.startswith(cache_filename_prefix)
+                or not filename.endswith(cache_filename_suffix)
+                or stale_filepath == filepath
+            ):
+                continue
+            try:
+                if os.stat(stale_filepath).st_mtime_ns < cache_mtime_ns:
+                    os.remove(stale_filepath)
+            except FileNotFoundError:
+                # already removed by a concurrent process
+                pass
+    except OSError:
+        # read-only or not available file-system, the snapshot is optional
+        pass
+
+
+class IndexedData(Mapping[str, Any]):
+    """
+    Indexed data, each table is loaded on first access.
+
+    All the tables are always listed as keys, the tables already loaded
+    are listed by `loaded_tables`. Tables are read from their snapshot
+    or built independently, the birthplace records of the 'codes' table
+    and of the 'municipalities' / 'countries' tables are deduplicated
+    when both have been loaded.
+    """
+
+    __slots__ = ("profile", "_tables", "_lock", "_records", "_records_tables")
+
+    def __init__(self, profile: DataProfile | None = None) -> None:
+        self.profile = profile or DataProfile()
+        self._tables: dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._records: dict[Birthplace, Birthplace] = {}
+        self._records_tables: set[str] = set()
+
+    def __getitem__(self, table: str) -> Any:
+        try:
+            return self._tables[table]
+        except KeyError:
+            return self._load_table(table)
+
+    def __contains__(self, table: object) -> bool:
+        return table in INDEXED_DATA_TABLES
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(INDEXED_DATA_TABLES)
+
+    def __len__(self) -> int:
+        return len(INDEXED_DATA_TABLES)
+
+    @property
+    def loaded_tables(self) -> tuple[str, ...]:
+        return tuple(self._tables)
+
+    def _load_table(self, table: str) -> Any:
+        if table not in INDEXED_DATA_TABLES:
+            raise KeyError(table)
+        with self._lock:
+            # the table could have been loaded by another thread
+            if table not in self._tables:
+                self._tables[table] = get_indexed_table(table, self.profile)
+                if table in ("municipalities", "countries", "codes"):
+                    self._share_records()
+            return self._tables[table]
+
+    def _share_records(self) -> None:
+        # records are deduplicated only when they could be duplicated
+        tables = {"municipalities", "countries", "codes"}.intersection(self._tables)
+        if "codes" not in tables or len(tables) < 2:
+            return
+        records = self._records
+        for table_name in sorted(tables - self._records_tables):
+            table_data = self._tables[table_name]
+            items = table_data.values() if table_name != "codes" else table_data
+            for item in items:
+                if item is not None:
+                    item.options = [
+                        records.setdefault(option, option) for option in item.options
+                    ]
+            self._records_tables.add(table_name)
+
+
+def get_indexed_data(profile: DataProfile | None = None) -> IndexedData:
+    return IndexedData(profile)
+
+
+def get_indexed_table(table: str, profile: DataProfile | None = None) -> Any:
+    profile = profile or DataProfile()
+    cache_filepath = get_indexed_data_cache_filepath(table, profile)
+    if cache_filepath:
+        data = read_indexed_data_cache(cache_filepath)
+        if data is not None and table in data:
+            return data[table]
+    table_data = build_indexed_table(table, profile)
+    if cache_filepath:
+        write_indexed_data_cache(cache_filepath, {table: table_data})
+    return table_data
+
+
+def build_indexed_table(table: str, profile: DataProfile | None = None) -> Any:
+    profile = profile or DataProfile()
+    if table == "names":
+        return get_names_index_data()
+    if table in ("municipalities", "countries") and profile.codes_only:
+        return {}
+    if table == "municipalities":
+        return _get_profile_intervals(build_municipalities_table(), profile)
+    if table == "countries":
+        return _get_profile_intervals(build_countries_table(), profile)
+    if table == "codes":
+        return _get_profile_codes(build_codes_table(), profile)
+    raise KeyError(table)
+
+
+def _get_profile_intervals(
+    birthplaces: dict[str, BirthplaceIntervals],
+    profile: DataProfile,
+) -> dict[str, BirthplaceIntervals]:
+    if profile.since is None:
+        return birthplaces
+    # intervals shared by many names are restricted only once
+    intervals: dict[int, BirthplaceIntervals] = {}
+    birthplaces_since: dict[str, BirthplaceIntervals] = {}
+    for name, birthplace_intervals in birthplaces.items():
+        intervals_key = id(birthplace_intervals)
+        if intervals_key not in intervals:
+            intervals[intervals_key] = birthplace_intervals.get_since(profile.since)
+        # names of birthplaces deleted before the start date are removed
+        if intervals[intervals_key].options:
+            birthplaces_since[name] = intervals[intervals_key]
+    return birthplaces_since
+
+
+def _get_profile_codes(
+    codes: list[BirthplaceIntervals | None],
+    profile: DataProfile,
+) -> list[BirthplaceIntervals | None]:
+    if profile.since is not None:
+        # codes of birthplaces deleted before the start date are kept
+        # without options, to tell them apart from the not existing ones
+        codes = [
+            intervals.get_since(profile.since) if intervals else None
+            for intervals in codes
+        ]
+    if profile.codes_only:
+        # alternative names are not needed to decode
+        records: dict[Birthplace, Birthplace] = {}
+        for intervals in codes:
+            if intervals:
+                intervals.options = [
+                    records.setdefault(option, _get_code_record(option))
+                    for option in intervals.options
+                ]
+    return codes
+
+
+def _get_code_record(record: Birthplace) -> Birthplace:
+    return record._replace(
+        name_slugs=(),
+        name_alt="",
+        name_trans=None,
+        name_alt_trans=None,
+        name_alt_en=None,
+    )
+
+
+def build_municipalities_table() -> dict[str, BirthplaceIntervals]:
+    municipalities: dict[str, list[Birthplace]] = {}
+    for municipality in get_municipalities_data():
+        # the keys are precomputed by scripts/updatedata.py,
+        # they are computed for data files without them
+        name_keys = municipality.get("name_keys")
+        if name_keys is None:
+            name_keys = get_municipality_name_keys(municipality)
+        municipality_record = Birthplace.from_dict(municipality)
+        for name in name_keys:
+            name = sys.intern(name)
+            municipalities.setdefault(name, [])
+            municipalities[name].append(municipality_record)
+    return _get_birthplaces_intervals(municipalities)
+
+
+def build_countries_table() -> dict[str, BirthplaceIntervals]:
+    countries: dict[str, list[Birthplace]] = {}
+    for country in get_countries_data():
+        country_record = Birthplace.from_dict(country)
+        for name in country_record.name_slugs:
+            countries.setdefault(name, [])
+            countries[name].append(country_record)
+    return _get_birthplaces_intervals(countries)
+
+
+def build_codes_table() -> list[BirthplaceIntervals | None]:
+    codes: dict[str, list[Birthplace]] = {}
+    for birthplace in get_municipalities_data() + get_countries_data():
+        birthplace_record = Birthplace.from_dict(birthplace)
+        codes.setdefault(birthplace_record.code, [])
+        codes[birthplace_record.code].append(birthplace_record)
+    codes_intervals = _get_birthplaces_intervals(codes)
+    codes_index: list[BirthplaceIntervals | None] = [None] * BIRTHPLACE_CODES_COUNT
+    for code, intervals in codes_intervals.items():
+        code_index = get_birthplace_code_index(code)
+        # records without a valid code (eg. 'ND') can't be looked up by code
+        if code_index is not None:
+            codes_index[code_index] = intervals
+    return codes_index
 
-    for code in data["names"]:
-        data["names"][code]["M"] = sorted(data["names"][code]["M"])
-        data["names"][code]["F"] = sorted(data["names"][code]["F"])
 
-    return data
+def _get_birthplaces_intervals(
+    birthplaces: dict[str, list[Birthplace]],
+) -> dict[str, BirthplaceIntervals]:
+    # options lists with the same items share the same intervals index
+    intervals: dict[tuple[int, ...], BirthplaceIntervals] = {}
+    birthplaces_intervals: dict[str, BirthplaceIntervals] = {}
+    for name, options in birthplaces.items():
+        options_key = tuple(id(option) for option in options)
+        if options_key not in intervals:
+            intervals[options_key] = BirthplaceIntervals(options)
+        birthplaces_intervals[name] = intervals[options_key]
+    return birthplaces_intervals
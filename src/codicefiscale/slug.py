@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import string
+import unicodedata
+
+# latin-1 supplement and latin extended-a blocks (italian and european names)
+_LATIN_CHARS: str = "".join(chr(code) for code in range(0x00C0, 0x0180))
+
+# letters without decomposition, transliterated as unidecode does
+_LATIN_LETTERS_EXTRA: dict[str, str] = {
+    "Æ": "ae",
+    "æ": "ae",
+    "Ð": "d",
+    "ð": "d",
+    "Đ": "d",
+    "đ": "d",
+    "Ħ": "h",
+    "ħ": "h",
+    "ı": "i",
+    "Ł": "l",
+    "ł": "l",
+    "Œ": "oe",
+    "œ": "oe",
+    "Ø": "o",
+    "ø": "o",
+    "ß": "ss",
+    "Þ": "th",
+    "þ": "th",
+    "Ŧ": "t",
+    "ŧ": "t",
+}
+
+# chars replaced by the separator, "&" (html entities) and ","
+# (removed between digits) are handled only by slugify
+_SEPARATORS: str = string.whitespace + string.punctuation.replace("&", "").replace(
+    ",", ""
+)
+
+# typographic quotes, transliterated to "'" and then removed by slugify
+_QUOTES: str = "‘’"
+
+
+def _get_latin_letter_ascii(char: str) -> str | None:
+    if char in _LATIN_LETTERS_EXTRA:
+        return _LATIN_LETTERS_EXTRA[char]
+    if not char.isalpha():
+        return None
+    chars = "".join(
+        char_decomposed
+        for char_decomposed in unicodedata.normalize("NFKD", char)
+        if not unicodedata.combining(char_decomposed)
+    )
+    if chars.isascii() and chars.isalpha():
+        return chars.lower()
+    return None
+
+
+def _get_latin_letter_unicode(char: str) -> str | None:
+    char_lower = char.lower()
+    if (
+        char.isalpha()
+        and unicodedata.normalize("NFKC", char) == char
+        and len(char_lower) == 1
+    ):
+        return char_lower
+    return None
+
+
+def _get_letters_table() -> dict[int, str | None]:
+    table: dict[int, str | None] = {}
+    for char in string.ascii_letters:
+        table[ord(char)] = char.lower()
+    for char in _LATIN_CHARS:
+        char_ascii = _get_latin_letter_ascii(char)
+        if char_ascii:
+            table[ord(char)] = char_ascii
+    # only letters are used to encode names
+    for char in string.digits + _SEPARATORS + _QUOTES + ",":
+        table[ord(char)] = None
+    return table
+
+
+def _get_slug_table(allow_unicode: bool) -> dict[int, str | None]:
+    table: dict[int, str | None] = {}
+    for char in string.ascii_letters + string.digits:
+        table[ord(char)] = char.lower()
+    get_latin_letter = (
+        _get_latin_letter_unicode if allow_unicode else _get_latin_letter_ascii
+    )
+    for char in _LATIN_CHARS:
+        char_slug = get_latin_letter(char)
+        if char_slug:
+            table[ord(char)] = char_slug
+    for char in _SEPARATORS:
+        table[ord(char)] = " "
+    for char in _QUOTES:
+        table[ord(char)] = " " if allow_unicode else None
+    return table
+
+
+_LETTERS_TABLE: dict[int, str | None] = _get_letters_table()
+_LETTERS_CHARS: frozenset[str] = frozenset(map(chr, _LETTERS_TABLE))
+_SLUG_DELETE_TABLE: dict[int, None] = dict.fromkeys(map(ord, string.digits + "-"))
+
+_SLUG_ASCII_TABLE: dict[int, str | None] = _get_slug_table(allow_unicode=False)
+_SLUG_ASCII_CHARS: frozenset[str] = frozenset(map(chr, _SLUG_ASCII_TABLE))
+_SLUG_UNICODE_TABLE: dict[int, str | None] = _get_slug_table(allow_unicode=True)
+_SLUG_UNICODE_CHARS: frozenset[str] = frozenset(map(chr, _SLUG_UNICODE_TABLE))
+
+
+def get_slug(text: str, allow_unicode: bool = False) -> str:
+    """
+    Gets the slug of the specified text, the same returned by slugify.
+
+    Latin letters, digits and separators are translated using precomputed
+    tables, slugify is used only for texts containing other characters.
+
+    :param text: The text
+    :type text: string
+    :param allow_unicode: If True, letters are not transliterated to ascii
+    :type allow_unicode: bool
+
+    :returns: The slug
+    :rtype: string
+    """
+    if allow_unicode:
+        table, chars = _SLUG_UNICODE_TABLE, _SLUG_UNICODE_CHARS
+    else:
+        table, chars = _SLUG_ASCII_TABLE, _SLUG_ASCII_CHARS
+    if chars.issuperset(text):
+        return "-".join(text.translate(table).split())
+    # slugify (and unidecode) are imported only if needed
+    from slugify import slugify
+
+    return slugify(text, allow_unicode=allow_unicode)
+
+
+def get_letters(text: str) -> str:
+    """
+    Gets the lowercase ascii letters of the specified text slug.
+
+    :param text: The text
+    :type text: string
+
+    :returns: The letters, in the same order
+    :rtype: string
+    """
+    if _LETTERS_CHARS.issuperset(text):
+        return text.translate(_LETTERS_TABLE)
+    from slugify import slugify
+
+    return slugify(text).translate(_SLUG_DELETE_TABLE)
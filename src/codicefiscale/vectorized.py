@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from typing import Any
+
+try:
+    import numpy as np
+    from numpy.typing import NDArray
+except ImportError as error:  # pragma: no cover
+    raise ImportError(
+        "[codicefiscale] numpy is required for vectorized validation, "
+        "install it with: pip install 'python-codicefiscale[numpy]'"
+    ) from error
+
+from codicefiscale.codicefiscale import (
+    _CIN_EVEN_TABLE,
+    _CIN_ODD_TABLE,
+    _MONTHS,
+    ErrorReason,
+)
+
+_CODE_LEN: int = 16
+
+_CHAR_LETTER: int = 1
+_CHAR_DIGIT: int = 2
+_CHAR_MONTH: int = 4
+
+
+def _get_upper_table() -> NDArray[np.uint8]:
+    table = np.arange(256, dtype=np.uint8)
+    table[ord("a") : ord("z") + 1] -= ord("a") - ord("A")
+    return table
+
+
+def _get_chars_table() -> NDArray[np.uint8]:
+    table = np.zeros(256, dtype=np.uint8)
+    for char in range(ord("A"), ord("Z") + 1):
+        table[char] |= _CHAR_LETTER
+    for char in range(ord("0"), ord("9") + 1):
+        table[char] |= _CHAR_DIGIT
+    for month in _MONTHS:
+        table[ord(month)] |= _CHAR_MONTH
+    return table
+
+
+def _get_chars_expected() -> NDArray[np.uint8]:
+    # same structure of CODICEFISCALE_RE, one mask per position
+    letter = _CHAR_LETTER
+    alnum = _CHAR_LETTER | _CHAR_DIGIT
+    month = _CHAR_MONTH
+    return np.array(
+        [letter] * 6  # lastname, firstname
+        + [alnum] * 2  # birthdate year
+        + [month]  # birthdate month
+        + [alnum] * 2  # birthdate day
+        + [letter]
+        + [alnum] * 3  # birthplace
+        + [letter],  # cin
+        dtype=np.uint8,
+    )
+
+
+_UPPER_TABLE: NDArray[np.uint8] = _get_upper_table()
+_CHARS_TABLE: NDArray[np.uint8] = _get_chars_table()
+_CHARS_EXPECTED: NDArray[np.uint8] = _get_chars_expected()
+_CIN_ODD_VALUES: NDArray[np.uint8] = np.frombuffer(_CIN_ODD_TABLE, dtype=np.uint8)
+_CIN_EVEN_VALUES: NDArray[np.uint8] = np.frombuffer(_CIN_EVEN_TABLE, dtype=np.uint8)
+
+
+def _get_records(codes: Any) -> NDArray[np.uint8]:
+    if isinstance(codes, np.ndarray):
+        if codes.dtype.kind != "S" or codes.dtype.itemsize != _CODE_LEN:
+            raise ValueError(
+                "[codicefiscale] 'codes' array dtype must be "
+                f"'S{_CODE_LEN}', not: {codes.dtype!r}"
+            )
+        return np.ascontiguousarray(codes).view(np.uint8).reshape(-1, _CODE_LEN)
+    buffer = memoryview(codes).cast("B")
+    buffer_len = len(buffer)
+    if buffer_len % _CODE_LEN:
+        raise ValueError(
+            f"[codicefiscale] 'codes' buffer length must be a multiple "
+            f"of {_CODE_LEN}, not: {buffer_len}"
+        )
+    return np.frombuffer(buffer, dtype=np.uint8).reshape(-1, _CODE_LEN)
+
+
+def validate(
+    codes: NDArray[np.bytes_] | bytes | bytearray | memoryview,
+) -> tuple[NDArray[np.bool_], NDArray[np.uint8]]:
+    """
+    Validates the syntax and the CIN of many codes at once.
+
+    Codes are not normalized (except for letters case), they must be
+    exactly 16 characters long without spaces or separators.
+
+    :param codes: The codes, as 'S16' array or buffer of 16-byte records
+    :type codes: numpy.ndarray or bytes-like
+
+    :returns: The valid rows mask and the ErrorReason value of each row (0 if valid)
+    :rtype: tuple
+    """
+    records = _UPPER_TABLE[_get_records(codes)]
+
+    syntax_valid = np.all(_CHARS_TABLE[records] & _CHARS_EXPECTED, axis=1)
+
+    cin_tot = _CIN_ODD_VALUES[records[:, 0:15:2]].sum(axis=1, dtype=np.int32)
+    cin_tot += _CIN_EVEN_VALUES[records[:, 1:15:2]].sum(axis=1, dtype=np.int32)
+    cin_valid = records[:, 15] == (cin_tot % 26 + ord("A"))
+
+    valid = syntax_valid & cin_valid
+    reasons = np.zeros(len(records), dtype=np.uint8)
+    reasons[~cin_valid] = ErrorReason.CIN
+    reasons[~syntax_valid] = ErrorReason.SYNTAX
+    return (valid, reasons)
@@ -0,0 +1,16 @@
+import os
+
+import pytest
+
+
+@pytest.fixture(scope="session", autouse=True)
+def cache_dir(tmp_path_factory):
+    # the indexed data snapshots written by the tests
+    # must not be mixed with the ones in the user cache dir
+    cache_dir = os.environ.get("CODICEFISCALE_CACHE_DIR")
+    os.environ["CODICEFISCALE_CACHE_DIR"] = str(tmp_path_factory.mktemp("cache"))
+    yield
+    if cache_dir is None:
+        os.environ.pop("CODICEFISCALE_CACHE_DIR", None)
+    else:
+        os.environ["CODICEFISCALE_CACHE_DIR"] = cache_dir
@@ -0,0 +1,90 @@
+from datetime import date
+
+import pytest
+
+from codicefiscale import codicefiscale
+from codicefiscale.cache import LRUCache
+
+
+@pytest.fixture
+def decode_cache():
+    codicefiscale.set_cache_maxsize(2)
+    yield
+    codicefiscale.set_cache_maxsize(0)
+
+
+def test_lru_cache():
+    """
+    Test that the least recently used entries are evicted.
+    """
+    cache = LRUCache(2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a", None) == 1
+    cache.set("c", 3)
+    assert cache.get("b", None) is None
+    assert cache.get("a", None) == 1
+    assert cache.get("c", None) == 3
+    info = cache.info()
+    assert (info.hits, info.misses, info.evictions) == (3, 1, 1)
+    assert (info.maxsize, info.currsize) == (2, 2)
+    cache.clear()
+    assert cache.info().currsize == 0
+    with pytest.raises(ValueError):
+        LRUCache(0)
+
+
+def test_decode_cache_disabled():
+    """
+    Test that the decode cache is disabled by default.
+    """
+    codicefiscale.decode("CCCFBA85D03L219P")
+    assert codicefiscale.cache_info() == (0, 0, 0, 0, 0)
+    with pytest.raises(ValueError):
+        codicefiscale.set_cache_maxsize(-1)
+
+
+def test_decode_cache(decode_cache):
+    """
+    Test that decode and is_valid share the cache keyed by normalized code.
+    """
+    data = codicefiscale.decode("CCCFBA85D03L219P")
+    assert codicefiscale.decode("cccfba85d03l219p") == data
+    assert codicefiscale.is_valid("CCC FBA 85 D03 L219 P")
+    info = codicefiscale.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (2, 1, 1)
+
+    # the reference year is part of the key
+    codicefiscale.decode("CCCFBA85D03L219P", reference_date=date(1984, 1, 1))
+    assert codicefiscale.cache_info().misses == 2
+
+    # errors are cached too and raised with the same message
+    for _ in range(2):
+        with pytest.raises(codicefiscale.DecodeError, match="wrong CIN"):
+            codicefiscale.decode("CCCFBA85D03L219B")
+    info = codicefiscale.cache_info()
+    assert (info.hits, info.misses, info.evictions) == (3, 3, 1)
+
+    codicefiscale.cache_clear()
+    assert codicefiscale.cache_info() == (0, 0, 0, 2, 0)
+
+
+def test_decode_cache_immutable(decode_cache):
+    """
+    Test that cached entries are not modified by callers mutating results.
+    """
+    data = codicefiscale.decode("CCCFBA85D03L219P")
+    data["omocodes"].clear()
+    data["birthplace"]["name"] = "MILANO"
+    data["birthplace"]["name_slugs"].append("milano")
+    result = codicefiscale.decode("CCCFBA85D03L219P", lazy=True)
+    result["omocodes"].clear()
+    result["raw"]["code"] = ""
+    result["birthplace"]["name"] = "MILANO"
+    result["birthplace"]["name_slugs"].append("milano")
+    assert result.to_dict()["birthplace"]["name_slugs"] == ["torino"]
+    data = codicefiscale.decode("CCCFBA85D03L219P")
+    assert len(data["omocodes"]) == 128
+    assert data["birthplace"]["name"] == "Torino"
+    assert data["birthplace"]["name_slugs"] == ["torino"]
+    assert data["raw"]["code"] == "CCCFBA85D03L219P"
@@ -1,6 +1,8 @@
+import pickle
+
 import pytest
 
-from codicefiscale import codicefiscale
+from codicefiscale import codicefiscale, data
 
 
 @pytest.fixture
@@ -39,9 +41,176 @@ def test_is_omocode(omocode_test_cases):
         assert codicefiscale.is_omocode(fiscal_code) == expected_result
 
 
+def test_is_omocode_without_data(monkeypatch, omocode_test_cases):
+    """
+    Test that `is_omocode` accepts unnormalized codes and doesn't load data.
+    """
+
+    def get_data():
+        raise AssertionError("data should not be loaded")
+
+    monkeypatch.setattr(codicefiscale, "_get_data", get_data)
+    assert codicefiscale.is_omocode("cccfba85d03l21ve") is True
+    assert codicefiscale.is_omocode("CCC FBA 85 D03 L219 P") is False
+    with pytest.raises(codicefiscale.DecodeError) as error:
+        codicefiscale.is_omocode("CCCFBA85D03L219B")
+    assert error.value.reason == codicefiscale.ErrorReason.CIN
+
+
+def test_canonical_code(omocode_test_cases):
+    """
+    Test that all the omocodes of a code have the same canonical code.
+    """
+    for fiscal_code, _ in omocode_test_cases:
+        assert codicefiscale.canonical_code(fiscal_code) == "CCCFBA85D03L219P"
+    assert codicefiscale.canonical_code("cccfba85d03lnmve") == "CCCFBA85D03L219P"
+    # month and birthplace letters are not translated
+    assert codicefiscale.canonical_code("RSSMRA80P01M100P") == "RSSMRA80P01M100P"
+    for omocode in codicefiscale.iter_omocodes("RSSMRA80P01M100P"):
+        assert codicefiscale.canonical_code(omocode) == "RSSMRA80P01M100P"
+    with pytest.raises(codicefiscale.DecodeError) as error:
+        codicefiscale.canonical_code("CCCFBA85D03L219")
+    assert error.value.reason == codicefiscale.ErrorReason.SYNTAX
+
+
 def test_is_valid(valid_fiscal_code_test_cases):
     """
     Test the `is_valid` function to verify if a fiscal code is valid.
     """
     for fiscal_code, expected_result in valid_fiscal_code_test_cases:
         assert codicefiscale.is_valid(fiscal_code) == expected_result
+
+
+@pytest.fixture
+def valid_fiscal_code_levels_test_cases():
+    return [
+        # code, syntax, checksum, date, full
+        ("CCCFBA85D03L219P", True, True, True, True),
+        ("CCCFBA85D03L21VE", True, True, True, True),
+        ("CCCFBA85D03L219", False, False, False, False),  # too short
+        ("CCCFBA85D03L219B", True, False, False, False),  # wrong CIN
+        ("CCCFBA85D00L219J", True, True, False, False),  # wrong birthdate day
+        ("CCCFBA01B69L219G", True, True, False, False),  # wrong birthdate day
+        ("CCCFBA00B69L219F", True, True, True, True),  # leap year
+        ("FRTMXM74L15D354A", True, True, True, False),  # wrong birthplace
+        ("CCCFBA85D03L2A9O", True, True, True, False),  # not omocodia letter
+        ("CCCFBA85D03HZ31K", True, True, True, False),  # not omocodia letter
+        ("CCCFBA85D03AA04N", True, True, True, False),  # not omocodia letter
+    ]
+
+
+def test_is_valid_levels(valid_fiscal_code_levels_test_cases):
+    """
+    Test the `is_valid` function with the different validation levels.
+    """
+    levels = ["syntax", "checksum", "date", "full"]
+    for fiscal_code, *expected_results in valid_fiscal_code_levels_test_cases:
+        for level, expected_result in zip(levels, expected_results, strict=True):
+            result = codicefiscale.is_valid(fiscal_code, level=level)
+            assert result == expected_result, (
+                f"Validation mismatch for {fiscal_code} with level {level!r}"
+            )
+
+
+def test_is_valid_levels_without_data(monkeypatch):
+    """
+    Test that the cheaper validation levels don't load the data.
+    """
+
+    def get_data():
+        raise AssertionError("data should not be loaded")
+
+    monkeypatch.setattr(codicefiscale, "_get_data", get_data)
+    for level in ["syntax", "checksum", "date"]:
+        assert codicefiscale.is_valid("CCCFBA85D03L219P", level=level)
+
+
+def test_is_valid_loads_only_codes_table(monkeypatch):
+    """
+    Test that the full validation loads only the codes table of the data.
+    """
+    indexed_data = data.get_indexed_data()
+    monkeypatch.setattr(codicefiscale, "_DATA", indexed_data)
+    monkeypatch.setattr(codicefiscale, "_DECODE_CACHE", None)
+    assert codicefiscale.is_valid("CCCFBA85D03L219P")
+    assert codicefiscale.is_valid("RSSMRA88A01Z330S")
+    assert indexed_data.loaded_tables == ("codes",)
+
+
+def test_is_valid_with_invalid_level():
+    """
+    Test the `is_valid` function with an invalid validation level.
+    """
+    with pytest.raises(ValueError):
+        codicefiscale.is_valid("CCCFBA85D03L219P", level="invalid")
+
+
+@pytest.fixture
+def error_reason_test_cases():
+    return [
+        ("CCCFBA85D03L219P", None),
+        ("CCC FBA 85 D03 L219 P", None),
+        ("CCCFBA85D03L21VE", None),
+        ("CCCFBA85D03L219", codicefiscale.ErrorReason.SYNTAX),  # too short
+        ("CCCFBA85D03L219B", codicefiscale.ErrorReason.CIN),  # wrong CIN
+        ("CCCFBA85D00L219J", codicefiscale.ErrorReason.DATE),  # wrong day
+        ("CCCFBAABD03L219P", codicefiscale.ErrorReason.DATE),  # wrong year
+        ("FRTMXM74L15D354A", codicefiscale.ErrorReason.BIRTHPLACE),  # unknown code
+        (
+            "CCCFBA85D03A659S",  # municipality not active at birthdate
+            codicefiscale.ErrorReason.BIRTHPLACE_DATE,
+        ),
+        # letters that are not omocodia letters in the birthplace code digits
+        ("CCCFBA85D03L2A9O", codicefiscale.ErrorReason.BIRTHPLACE),
+        ("CCCFBA85D03HZ31K", codicefiscale.ErrorReason.BIRTHPLACE),
+        ("CCCFBA85D03AA04N", codicefiscale.ErrorReason.BIRTHPLACE),
+    ]
+
+
+def test_get_error_reason(error_reason_test_cases):
+    """
+    Test the `get_error_reason` function returns the reason without raising.
+    """
+    for fiscal_code, expected_reason in error_reason_test_cases:
+        reason = codicefiscale.get_error_reason(fiscal_code)
+        assert reason == expected_reason, f"Reason mismatch for {fiscal_code}"
+        assert codicefiscale.is_valid(fiscal_code) == (expected_reason is None)
+        if expected_reason is None:
+            continue
+        with pytest.raises(codicefiscale.DecodeError) as error:
+            codicefiscale.decode(fiscal_code)
+        assert error.value.reason == expected_reason
+        assert isinstance(error.value, ValueError)
+
+
+def test_get_error_reason_levels():
+    """
+    Test the `get_error_reason` function with the different validation levels.
+    """
+    fiscal_code = "FRTMXM74L15D354A"  # wrong birthplace
+    assert codicefiscale.get_error_reason(fiscal_code, level="date") is None
+    assert (
+        codicefiscale.get_error_reason(fiscal_code, level="full")
+        == codicefiscale.ErrorReason.BIRTHPLACE
+    )
+    fiscal_code = "CCCFBA85D00L219B"  # wrong birthdate and CIN
+    assert (
+        codicefiscale.get_error_reason(fiscal_code, level="checksum")
+        == codicefiscale.ErrorReason.CIN
+    )
+    assert (
+        codicefiscale.get_error_reason(fiscal_code, level="full")
+        == codicefiscale.ErrorReason.DATE
+    )
+    with pytest.raises(ValueError):
+        codicefiscale.get_error_reason(fiscal_code, level="invalid")
+
+
+def test_decode_error_pickle():
+    """
+    Test that the DecodeError can be pickled, eg. for multiprocessing.
+    """
+    error = codicefiscale.decode_many(["CCCFBA85D03L219B"])[0]
+    error_copy = pickle.loads(pickle.dumps(error))
+    assert str(error_copy) == str(error)
+    assert error_copy.reason == codicefiscale.ErrorReason.CIN
@@ -0,0 +1,331 @@
+import os
+from datetime import date
+
+import pytest
+
+from codicefiscale import data
+
+
+def test_indexed_data_cache_written_and_reused(monkeypatch, tmp_path):
+    """
+    Test that the indexed data snapshots are written on first run and then reused.
+    """
+    monkeypatch.setenv("CODICEFISCALE_CACHE_DIR", str(tmp_path))
+    cache_filepath = data.get_indexed_data_cache_filepath("codes")
+    assert cache_filepath.startswith(str(tmp_path))
+    assert cache_filepath.endswith(".full.codes.pickle")
+    assert not os.path.exists(cache_filepath)
+
+    indexed_data = data.get_indexed_data()
+    assert indexed_data["codes"][11219] is not None
+    assert indexed_data["names"]["FBA"]
+    assert os.path.exists(cache_filepath)
+    assert os.path.exists(data.get_indexed_data_cache_filepath("names"))
+
+    def build_indexed_table(table, profile):
+        raise AssertionError("indexed data should be read from snapshot")
+
+    monkeypatch.setattr(data, "build_indexed_table", build_indexed_table)
+    cached_indexed_data = data.get_indexed_data()
+    assert (
+        cached_indexed_data["codes"][11219].options
+        == indexed_data["codes"][11219].options
+    )
+    assert cached_indexed_data["names"]["FBA"] == indexed_data["names"]["FBA"]
+    assert sorted(cached_indexed_data.loaded_tables) == ["codes", "names"]
+
+
+def test_indexed_data_cache_invalidation(monkeypatch, tmp_path):
+    """
+    Test that the snapshot is rebuilt when the version or data files change.
+    """
+    monkeypatch.setenv("CODICEFISCALE_CACHE_DIR", str(tmp_path))
+    cache_filepath = data.get_indexed_data_cache_filepath("countries")
+    data.get_indexed_data()["countries"]
+
+    monkeypatch.setattr(data, "__version__", "0.0.0")
+    assert data.get_indexed_data_cache_filepath("countries") != cache_filepath
+    data.get_indexed_data()["countries"]
+    data.get_indexed_data()["names"]
+    # snapshots of other versions (eg. used by other environments) are kept
+    cache_filenames = [
+        os.path.basename(cache_filepath),
+        os.path.basename(data.get_indexed_data_cache_filepath("countries")),
+        os.path.basename(data.get_indexed_data_cache_filepath("names")),
+    ]
+    assert sorted(os.listdir(tmp_path)) == sorted(cache_filenames)
+
+    data_filepath = data.get_data_filepath("names.json")
+    data_filestat = os.stat(data_filepath)
+    cache_key = data.get_indexed_data_cache_key("names")
+    cache_key_other = data.get_indexed_data_cache_key("countries")
+    try:
+        os.utime(
+            data_filepath,
+            ns=(data_filestat.st_atime_ns, data_filestat.st_mtime_ns + 1),
+        )
+        assert data.get_indexed_data_cache_key("names") != cache_key
+        assert data.get_indexed_data_cache_key("countries") == cache_key_other
+        data.get_indexed_data()["names"]
+        # stale snapshots of the same version and table are removed
+        cache_filenames[2] = os.path.basename(
+            data.get_indexed_data_cache_filepath("names")
+        )
+        assert sorted(os.listdir(tmp_path)) == sorted(cache_filenames)
+    finally:
+        os.utime(
+            data_filepath,
+            ns=(data_filestat.st_atime_ns, data_filestat.st_mtime_ns),
+        )
+
+
+def test_indexed_data_cache_corrupted(monkeypatch, tmp_path):
+    """
+    Test that a corrupted snapshot is ignored and rewritten.
+    """
+    monkeypatch.setenv("CODICEFISCALE_CACHE_DIR", str(tmp_path))
+    cache_filepath = data.get_indexed_data_cache_filepath("codes")
+    with open(cache_filepath, "wb") as file:
+        file.write(b"not a pickle")
+    indexed_data = data.get_indexed_data()
+    assert indexed_data["codes"][11219] is not None
+    assert data.read_indexed_data_cache(cache_filepath) is not None
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="requires file owners")
+def test_indexed_data_cache_untrusted(monkeypatch, tmp_path):
+    """
+    Test that snapshots writable or owned by other users are not loaded.
+    """
+    monkeypatch.setenv("CODICEFISCALE_CACHE_DIR", str(tmp_path))
+    data.get_indexed_data()["countries"]
+    cache_filepath = data.get_indexed_data_cache_filepath("countries")
+    assert os.stat(cache_filepath).st_mode & 0o077 == 0
+    assert data.read_indexed_data_cache(cache_filepath) is not None
+
+    os.chmod(cache_filepath, 0o666)
+    assert data.read_indexed_data_cache(cache_filepath) is None
+    os.chmod(cache_filepath, 0o600)
+    assert data.read_indexed_data_cache(cache_filepath) is not None
+
+    uid = os.getuid()
+    monkeypatch.setattr(os, "getuid", lambda: uid + 1)
+    assert data.read_indexed_data_cache(cache_filepath) is None
+
+
+def test_indexed_data_cache_disabled(monkeypatch, tmp_path):
+    """
+    Test that the snapshot can be disabled using an empty cache dir.
+    """
+    monkeypatch.setenv("CODICEFISCALE_CACHE_DIR", "")
+    assert data.get_cache_dir() is None
+    assert data.get_indexed_data_cache_filepath("codes") is None
+    indexed_data = data.get_indexed_data()
+    assert indexed_data["codes"][11219] is not None
+
+
+def test_indexed_data_lazy_tables(monkeypatch):
+    """
+    Test that each table of the indexed data is loaded only on first access.
+    """
+    tables = []
+    get_indexed_table = data.get_indexed_table
+
+    def get_indexed_table_counted(table, profile):
+        tables.append(table)
+        return get_indexed_table(table, profile)
+
+    monkeypatch.setattr(data, "get_indexed_table", get_indexed_table_counted)
+    indexed_data = data.get_indexed_data()
+    assert tables == []
+    assert indexed_data["codes"][11219] is not None
+    assert indexed_data["codes"][25330] is not None
+    assert tables == ["codes"]
+    assert indexed_data["names"]["FBA"]
+    assert tables == ["codes", "names"]
+    assert indexed_data.loaded_tables == ("codes", "names")
+    # all the tables are listed, even if not loaded yet
+    assert list(indexed_data) == list(data.INDEXED_DATA_TABLES)
+    assert len(indexed_data) == len(data.INDEXED_DATA_TABLES)
+    assert "municipalities" in indexed_data
+    assert "unknown" not in indexed_data
+    assert tables == ["codes", "names"]
+    assert indexed_data.get("municipalities")["torino"]
+    assert tables == ["codes", "names", "municipalities"]
+    assert indexed_data.get("unknown") is None
+    with pytest.raises(KeyError):
+        indexed_data["unknown"]
+
+
+def test_indexed_data_shared_records():
+    """
+    Test that the tables loaded separately share the same birthplace records.
+    """
+    indexed_data = data.get_indexed_data()
+    record = indexed_data["codes"][11219].get()
+    record_by_name = indexed_data["municipalities"]["torino"].get()
+    assert record == record_by_name
+    assert record is record_by_name
+    assert indexed_data["codes"][11219].get() is record
+
+
+def _get_birthplace(name, date_created, date_deleted):
+    return data.Birthplace(
+        code="A001",
+        name=name,
+        province="TO",
+        active=date_deleted is None,
+        date_created=date_created,
+        date_deleted=date_deleted,
+        name_slugs=(name.lower(),),
+    )
+
+
+def test_birthplace_record():
+    """
+    Test that the birthplace records are converted back to the source data.
+    """
+    municipalities = data.get_municipalities_data()[:100]
+    countries = data.get_countries_data()
+    for birthplace in municipalities + countries:
+        birthplace.pop("name_keys", None)
+        record = data.Birthplace.from_dict(birthplace)
+        assert record.to_dict() == birthplace
+        assert list(record.to_dict()) == sorted(birthplace)
+
+
+def test_birthplace_record_interned():
+    """
+    Test that the records of the indexed data share the same strings and dates.
+    """
+    codes = data.build_codes_table()
+    record = codes[11219].get()
+    record_other = codes[11727].get()
+    assert isinstance(record, data.Birthplace)
+    assert record.province is record_other.province
+    assert record.date_created is data._get_date("1889-08-12T00:00:00")
+    assert record.name_slugs[0] in data.build_municipalities_table()
+
+
+def test_birthplace_intervals():
+    """
+    Test the date-aware lookup of birthplaces sharing the same code.
+    """
+    options = [
+        _get_birthplace("A", date(1900, 1, 1), date(1920, 12, 31)),
+        _get_birthplace("B", date(1930, 1, 1), None),
+    ]
+    intervals = data.BirthplaceIntervals(options)
+    assert intervals.get(None).name == "A"
+    # created before / deleted after birthdate
+    assert intervals.get(date(1900, 1, 1)).name == "A"
+    assert intervals.get(date(1920, 12, 31)).name == "A"
+    assert intervals.get(date(1930, 1, 1)).name == "B"
+    assert intervals.get(date(2020, 1, 1)).name == "B"
+    # birthdate in the missing date-range between deleted and created
+    assert intervals.get(date(1925, 6, 1)).name == "B"
+    # birthdate before the first creation date (issues #210, #213)
+    assert intervals.get(date(1850, 1, 1)).name == "A"
+
+
+def test_birthplace_intervals_short_lived():
+    """
+    Test that a birthplace deleted one day after creation is preferred in gaps.
+    """
+    options = [
+        _get_birthplace("A", date(1900, 1, 1), date(1900, 1, 2)),
+        _get_birthplace("B", date(1930, 1, 1), date(1940, 1, 1)),
+    ]
+    intervals = data.BirthplaceIntervals(options)
+    assert intervals.get(date(1910, 1, 1)).name == "A"
+    assert intervals.get(date(1935, 1, 1)).name == "B"
+    assert intervals.get(date(1950, 1, 1)).name == "A"
+    intervals = data.BirthplaceIntervals(options[1:])
+    assert intervals.get(date(1950, 1, 1)) is None
+
+
+def test_birthplace_code_index():
+    """
+    Test the index of the birthplace codes in the codes index.
+    """
+    assert data.get_birthplace_code_index("A001") == 1
+    assert data.get_birthplace_code_index("L219") == 11219
+    assert data.get_birthplace_code_index("Z999") == data.BIRTHPLACE_CODES_COUNT - 1
+    assert data.get_birthplace_code_index("ND") is None
+    assert data.get_birthplace_code_index("l219") is None
+    assert data.get_birthplace_code_index("L2I9") is None
+    assert data.get_birthplace_code_index("L2²9") is None
+
+
+def test_indexed_data_codes_index():
+    """
+    Test that the codes index is a flat list addressed by code index.
+    """
+    codes = data.build_codes_table()
+    assert len(codes) == data.BIRTHPLACE_CODES_COUNT
+    assert codes[data.get_birthplace_code_index("L219")].get().name == "Torino"
+    assert codes[data.get_birthplace_code_index("Z330")].get().name == "Marocco"
+    assert codes[data.get_birthplace_code_index("Z999")] is None
+
+
+def test_municipality_name_keys():
+    """
+    Test the keys used to index a municipality by name.
+    """
+    municipality = {
+        "name": "Forlì",
+        "name_slugs": ["forli"],
+        "province": "FC",
+    }
+    assert data.get_municipality_name_keys(municipality) == [
+        "forlì",
+        "forlì-fc",
+        "forli",
+        "forli-fc",
+    ]
+
+
+def test_indexed_data_precomputed_name_keys(monkeypatch):
+    """
+    Test that precomputed name keys are used and not stored in the records.
+    """
+    municipality = {
+        "active": True,
+        "code": "L219",
+        "date_created": "1889-08-12T00:00:00",
+        "date_deleted": "",
+        "name": "Torino",
+        "name_keys": ["turin"],
+        "name_slugs": ["torino"],
+        "province": "TO",
+    }
+    monkeypatch.setattr(data, "get_municipalities_data", lambda: [municipality])
+    assert list(data.build_municipalities_table()) == ["turin"]
+    assert "name_keys" not in data.build_codes_table()[11219].get().to_dict()
+
+
+def test_names_index_data():
+    """
+    Test that the precomputed names index matches the names data.
+    """
+    names_index = data.get_names_index_data()
+    assert names_index == data.build_names_index(data.get_names_data())
+    assert names_index["FBA"] == {"F": ["Fabia"], "M": ["Fabio"]}
+
+
+def test_names_index_data_missing_file(monkeypatch, tmp_path):
+    """
+    Test that the names index is built when the precomputed file is missing.
+    """
+    get_data_filepath = data.get_data_filepath
+    monkeypatch.setattr(
+        data,
+        "get_data_filepath",
+        lambda filename: (
+            str(tmp_path / filename)
+            if filename == "names-index.json"
+            else get_data_filepath(filename)
+        ),
+    )
+    assert data.get_names_index_data()["FBA"] == {"F": ["Fabia"], "M": ["Fabio"]}
+    assert data.get_indexed_data_cache_key("names")
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date, datetime
 
 import pytest
 
@@ -450,3 +450,207 @@ def test_decode_firstname():
     # test with invalid code
     names_invalid = codicefiscale.decode_firstname("XXX")
     assert names_invalid is None
+
+
+def test_decode_lazy():
+    """Test lazy decoding returns the same data computed on first access."""
+    code = "CCCFBA85D03L219P"
+    decoded = codicefiscale.decode(code)
+    decoded_lazy = codicefiscale.decode(code, lazy=True)
+    assert isinstance(decoded_lazy, codicefiscale.DecodeResult)
+    assert not hasattr(decoded_lazy, "__dict__")
+
+    # expensive values are not computed until accessed
+    assert decoded_lazy.gender == "M"
+    assert decoded_lazy["birthdate"] == datetime(1985, 4, 3)
+    assert decoded_lazy._omocodes is None
+    assert decoded_lazy._firstname_options is None
+    assert decoded_lazy["omocodes"] == decoded["omocodes"]
+    assert decoded_lazy.omocodes is decoded_lazy.omocodes
+
+    # mapping view is backwards compatible with the dict
+    assert list(decoded_lazy.keys()) == list(decoded.keys())
+    assert decoded_lazy == decoded
+    assert decoded_lazy.to_dict() == decoded
+    assert decoded_lazy.get("invalid") is None
+    with pytest.raises(KeyError):
+        decoded_lazy["invalid"]
+
+    # dict values are independent copies
+    decoded_dict = decoded_lazy.to_dict()
+    decoded_dict["birthplace"]["name"] = "Milano"
+    decoded_dict["omocodes"].clear()
+    assert decoded_lazy["birthplace"]["name"] == "Torino"
+    assert len(decoded_lazy["omocodes"]) == 128
+
+
+def test_decode_lazy_with_invalid_code():
+    """Test lazy decoding raises the same errors."""
+    with pytest.raises(ValueError):
+        codicefiscale.decode("CCCFBA85D03L219B", lazy=True)  # wrong CIN
+
+
+def test_decode_many():
+    """Test decoding many fiscal codes with errors returned as values."""
+    codes = [
+        "CCCFBA85D03L219P",
+        "CCCFBA85D03L219B",  # wrong CIN
+        "THDSDA95P08Z330H",
+        "invalid",
+        "CCCFBA85D03L2A9O",  # not omocodia letter in birthplace code
+    ]
+    results = codicefiscale.decode_many(codes)
+    assert len(results) == 5
+    assert results[0] == codicefiscale.decode(codes[0])
+    assert isinstance(results[1], ValueError)
+    assert "wrong CIN" in str(results[1])
+    assert results[2] == codicefiscale.decode(codes[2])
+    assert isinstance(results[3], ValueError)
+    assert isinstance(results[4], ValueError)
+    assert "wrong birthplace code" in str(results[4])
+
+
+def test_decode_many_invalid_types():
+    """Test that items that are not strings are returned as syntax errors."""
+    codes = ["CCCFBA85D03L219P", None, 10**12, b"CCCFBA85D03L219P", ["invalid"]]
+    results = codicefiscale.decode_many(codes)
+    assert len(results) == 5
+    assert results[0] == results[3] == codicefiscale.decode(codes[0])
+    for result in [results[1], results[2], results[4]]:
+        assert isinstance(result, codicefiscale.DecodeError)
+        assert result.reason == codicefiscale.ErrorReason.SYNTAX
+    assert str(results[1]) == "[codicefiscale] invalid syntax: None"
+    results = list(codicefiscale.iter_decode(codes, lazy=True))
+    assert isinstance(results[1], codicefiscale.DecodeError)
+    assert isinstance(results[3], codicefiscale.DecodeResult)
+
+
+def test_iter_decode(monkeypatch):
+    """Test decoding many fiscal codes resolving each birthplace only once."""
+    calls = []
+    get_birthplace_by_code_index = codicefiscale._get_birthplace_by_code_index
+
+    def get_birthplace_by_code_index_counted(birthplace_code_index, birthdate):
+        calls.append((birthplace_code_index, birthdate))
+        return get_birthplace_by_code_index(birthplace_code_index, birthdate)
+
+    monkeypatch.setattr(
+        codicefiscale,
+        "_get_birthplace_by_code_index",
+        get_birthplace_by_code_index_counted,
+    )
+    codes = ["CCCFBA85D03L219P", "CCCFBA85D03L21VE", "TKKYKU87B68L219F"] * 10
+    results = codicefiscale.iter_decode(codes, lazy=True)
+    assert not isinstance(results, list)
+    for result in results:
+        assert isinstance(result, codicefiscale.DecodeResult)
+        assert result["birthplace"]["name"] == "Torino"
+    assert len(calls) == 2
+
+
+def test_decode_raw_normalization():
+    """Test decoding raw data from canonical, messy and bytes-like input."""
+    expected_raw = codicefiscale.decode_raw("CCCFBA85D03L219P")
+    assert codicefiscale.decode_raw("cccfba85d03l219p") == expected_raw
+    assert codicefiscale.decode_raw("CCC FBA 85 D03 L219 P") == expected_raw
+    assert codicefiscale.decode_raw("CCC-FBA-85-D03-L219-P") == expected_raw
+    assert codicefiscale.decode_raw(b"CCCFBA85D03L219P") == expected_raw
+    assert codicefiscale.decode_raw(bytearray(b"CCCFBA85D03L219P")) == expected_raw
+    assert codicefiscale.decode_raw(memoryview(b"CCCFBA85D03L219P")) == expected_raw
+    assert codicefiscale.is_valid(b"CCCFBA85D03L219P")
+    assert not codicefiscale.is_valid(b"CCCFBA85D03L219\xe9")
+    with pytest.raises(ValueError):
+        codicefiscale.decode_raw(b"CCCFBA85D03L219")
+
+
+def test_decode_raw_with_invalid_type():
+    """Test that codes that are not strings or bytes-like raise TypeError."""
+    for code in [None, 10**12, 16.0, ["CCCFBA85D03L219P"]]:
+        with pytest.raises(TypeError):
+            codicefiscale.decode_raw(code)
+        with pytest.raises(TypeError):
+            codicefiscale.decode(code)
+        with pytest.raises(TypeError):
+            codicefiscale.is_valid(code, level="syntax")
+
+
+def test_iter_omocodes(decode_omocodes_test_case):
+    """Test iterating omocodes lazily, ordered by substitution level."""
+    code = decode_omocodes_test_case["input"]
+    expected_omocodes = decode_omocodes_test_case["expected_omocodes"]
+    omocodes = codicefiscale.iter_omocodes(code)
+    assert next(omocodes) == code
+    assert [code] + list(omocodes) == expected_omocodes
+    # same omocodes, whatever omocode is used as input
+    assert list(codicefiscale.iter_omocodes("CCCFBAURDLPLNMVU")) == expected_omocodes
+    assert list(codicefiscale.iter_omocodes(code, max_level=0)) == [code]
+    assert (
+        list(codicefiscale.iter_omocodes(code, max_level=1)) == (expected_omocodes[0:8])
+    )
+    assert (
+        list(codicefiscale.iter_omocodes(code, max_level=2))
+        == (expected_omocodes[0:29])
+    )
+    assert list(codicefiscale.iter_omocodes(code, max_level=10)) == expected_omocodes
+
+
+def test_iter_omocodes_with_invalid_args():
+    """Test iterating omocodes with invalid arguments."""
+    with pytest.raises(ValueError):
+        codicefiscale.iter_omocodes("CCCFBA85D03L219")
+    with pytest.raises(ValueError):
+        codicefiscale.iter_omocodes("CCCFBA85D03L219P", max_level=-1)
+
+
+def test_decode_without_date_parsing(monkeypatch):
+    """
+    Test that the birthdate is built from the decoded components directly.
+    """
+
+    def get_date(date):
+        raise AssertionError("birthdate should not be parsed")
+
+    monkeypatch.setattr(codicefiscale, "_get_date", get_date)
+    data = codicefiscale.decode("CCCFBA85D03L219P")
+    assert data["birthdate"] == datetime(1985, 4, 3)
+    with pytest.raises(ValueError):
+        codicefiscale.decode("CCCFBA85D00L219J")
+
+
+def test_decode_reference_date():
+    """
+    Test that the reference date fixes the century of the birthdate year.
+    """
+    code = "CCCFBA85D03L219P"
+    data = codicefiscale.decode(code, reference_date=date(1990, 1, 1))
+    assert data["birthdate"] == datetime(1985, 4, 3)
+    data = codicefiscale.decode(code, reference_date=date(1984, 12, 31))
+    assert data["birthdate"] == datetime(1885, 4, 3)
+    results = codicefiscale.decode_many([code], reference_date=date(1984, 1, 1))
+    assert results[0]["birthdate"] == datetime(1885, 4, 3)
+    assert codicefiscale.is_valid(code, reference_date=date(1984, 1, 1))
+
+
+def test_set_reference_date():
+    """
+    Test the module-level reference date setting.
+    """
+    code = "CCCFBA85D03L219P"
+    assert codicefiscale.get_reference_date() == date.today()
+    try:
+        codicefiscale.set_reference_date(date(1984, 1, 1))
+        assert codicefiscale.get_reference_date() == date(1984, 1, 1)
+        assert codicefiscale.decode(code)["birthdate"] == datetime(1885, 4, 3)
+        # the argument has precedence over the setting
+        data = codicefiscale.decode(code, reference_date=date(2000, 1, 1))
+        assert data["birthdate"] == datetime(1985, 4, 3)
+    finally:
+        codicefiscale.set_reference_date(None)
+    assert codicefiscale.decode(code)["birthdate"] == datetime(1985, 4, 3)
+
+
+def test_decode_birthplace_code_index():
+    """Test the codes index of omocode birthplace codes."""
+    for code in codicefiscale.iter_omocodes("CCCFBA85D03L219P"):
+        raw = codicefiscale.decode_raw(code)
+        assert codicefiscale._get_birthplace_code_index(raw) == 11219
@@ -1,8 +1,9 @@
-from datetime import datetime
+from datetime import date, datetime
 
 import pytest
 
 from codicefiscale import codicefiscale
+from codicefiscale.cache import LRUCache
 
 
 @pytest.fixture
@@ -32,6 +33,7 @@ def firstname_test_cases():
 def birthdate_formats_test_cases():
     return [
         {"input": datetime(1985, 4, 3), "result": "85D03"},
+        {"input": date(1985, 4, 3), "result": "85D03"},
         {"input": "03 04 1985", "result": "85D03"},
         {"input": "03/04/1985", "result": "85D03"},
         {"input": "03-04-1985", "result": "85D03"},
@@ -46,6 +48,10 @@ def birthdate_formats_test_cases():
         {"input": "1985/4/3", "result": "85D03"},
         {"input": "1985-4-3", "result": "85D03"},
         {"input": "1985.4.3", "result": "85D03"},
+        # not handled by the fast parser, parsed using dateutil
+        {"input": "04/25/1985", "result": "85D25"},
+        {"input": "3 April 1985", "result": "85D03"},
+        {"input": "1985-04-03T10:30:00", "result": "85D03"},
     ]
 
 
@@ -208,6 +214,17 @@ def test_encode_birthdate_formats(birthdate_formats_test_cases):
         assert codicefiscale.encode_birthdate(case["input"], "M") == case["result"]
 
 
+def test_encode_birthdate_without_dateutil(monkeypatch):
+    """Test that common birthdate formats are parsed without dateutil."""
+
+    def parse_date(date):
+        raise AssertionError("dateutil should not be used")
+
+    monkeypatch.setattr(codicefiscale, "_parse_date", parse_date)
+    for value in ["03/04/1985", "3-4-1985", "1985-04-03", "1985/4/3", "03.04.1985"]:
+        assert codicefiscale.encode_birthdate(value, "M") == "85D03"
+
+
 def test_encode_birthdate_invalid_arguments():
     """Test invalid arguments for encoding birthdates."""
     with pytest.raises(ValueError):
@@ -252,6 +269,29 @@ def test_encode_birthplace_created_after_birthdate():
     assert result == "L219"
 
 
+def test_encode_birthplace_cache(monkeypatch):
+    """Test that resolved birthplaces, including misses, are cached."""
+    monkeypatch.setattr(codicefiscale, "_BIRTHPLACES_CACHE", LRUCache(2))
+    lookups = []
+    get_birthplace_options = codicefiscale._get_birthplace_options
+
+    def get_birthplace_options_counted(birthplace):
+        lookups.append(birthplace)
+        return get_birthplace_options(birthplace)
+
+    monkeypatch.setattr(
+        codicefiscale, "_get_birthplace_options", get_birthplace_options_counted
+    )
+    for _ in range(3):
+        assert codicefiscale.encode_birthplace("Torino (TO)") == "L219"
+        with pytest.raises(ValueError):
+            codicefiscale.encode_birthplace("Area 51, Nevada")
+    assert lookups == ["Torino (TO)", "Torino ", "Area 51, Nevada", "Area 51"]
+    # the date is not part of the cache key
+    assert codicefiscale.encode_birthplace("Torino (TO)", "01/01/1888") == "L219"
+    assert len(lookups) == 4
+
+
 def test_encode_cin(cin_test_cases):
     """Test encoding CIN."""
     for case in cin_test_cases:
@@ -264,9 +304,162 @@ def test_encode_cin_invalid_arguments():
         codicefiscale.encode_cin(None)
     with pytest.raises(ValueError):
         codicefiscale.encode_cin("CCCFBA85D03")
+    with pytest.raises(ValueError):
+        codicefiscale.encode_cin("cccfba85d03l219")
+    with pytest.raises(ValueError):
+        codicefiscale.encode_cin("CCCFBA85D03L21-")
+
+
+def test_encode_cin_bytes(cin_test_cases):
+    """Test encoding CIN from bytes."""
+    for case in cin_test_cases:
+        assert codicefiscale.encode_cin(case["input"].encode()) == case["result"]
 
 
 def test_encode(encode_test_cases):
     """Test encoding full fiscal codes."""
     for case in encode_test_cases:
         assert codicefiscale.encode(**case["input"]) == case["result"]
+
+
+def test_encode_many(encode_test_cases):
+    """Test encoding many records, as dicts or tuples."""
+    records = [case["input"] for case in encode_test_cases]
+    results = [case["result"] for case in encode_test_cases]
+    assert codicefiscale.encode_many(records) == results
+    records = [
+        (
+            record["lastname"],
+            record["firstname"],
+            record["gender"],
+            record["birthdate"],
+            record["birthplace"],
+        )
+        for record in records
+    ]
+    assert list(codicefiscale.iter_encode(records)) == results
+
+
+def test_encode_many_errors():
+    """Test that invalid records are returned as errors."""
+    records = [
+        ("Caccamo", "Fabio", "M", "03/04/1985", "Torino"),
+        ("Caccamo", "Fabio", "M", "03/04/1985", "Area 51"),
+        ("Caccamo", "Fabio", "X", "03/04/1985", "Torino"),
+        ("Caccamo", "Fabio", "M", "03/04/1985", "Torino"),
+    ]
+    results = codicefiscale.encode_many(records)
+    assert results[0] == results[3] == "CCCFBA85D03L219P"
+    assert isinstance(results[1], ValueError)
+    assert "not mapped to code" in str(results[1])
+    assert isinstance(results[2], ValueError)
+
+
+def test_encode_many_malformed_records():
+    """Test that malformed records are returned as errors."""
+    records = [
+        ("Caccamo", "Fabio", "M", "03/04/1985", "Torino"),
+        ("Caccamo", "Fabio", "M"),
+        {
+            "lastname": "Caccamo",
+            "firstname": "Fabio",
+            "gender": "M",
+            "birthdate": "03/04/1985",
+        },
+        (None, "Fabio", "M", "03/04/1985", "Torino"),
+        ("Caccamo", "Fabio", "M", ["03/04/1985"], "Torino"),
+        ("Caccamo", "Fabio", "M", "03/04/1985", "Torino"),
+    ]
+    results = list(codicefiscale.iter_encode(records))
+    assert len(results) == 6
+    assert results[0] == results[5] == "CCCFBA85D03L219P"
+    for result in results[1:5]:
+        assert isinstance(result, ValueError)
+        assert str(result).startswith("[codicefiscale] invalid record:")
+    assert isinstance(results[2].__cause__, KeyError)
+    assert isinstance(results[3].__cause__, TypeError)
+
+
+def test_encode_verify(monkeypatch):
+    """Test that the encoded code check can be skipped."""
+    checked_codes = []
+    check_code = codicefiscale._check_code
+
+    def check_code_tracked(code, current_year):
+        checked_codes.append(code)
+        check_code(code, current_year)
+
+    monkeypatch.setattr(codicefiscale, "_check_code", check_code_tracked)
+    args = ("Caccamo", "Fabio", "M", "03/04/1985", "Torino")
+    assert codicefiscale.encode(*args) == "CCCFBA85D03L219P"
+    assert checked_codes == ["CCCFBA85D03L219P"]
+    assert codicefiscale.encode(*args, verify=False) == "CCCFBA85D03L219P"
+    assert codicefiscale.encode_many([args], verify=False) == ["CCCFBA85D03L219P"]
+    assert len(checked_codes) == 1
+
+
+def test_encode_verify_error(monkeypatch):
+    """Test that the encoded code check raises the decode errors."""
+    monkeypatch.setattr(
+        codicefiscale,
+        "_decode_normalized",
+        lambda *args: codicefiscale.ErrorReason.BIRTHPLACE_DATE,
+    )
+    args = ("Caccamo", "Fabio", "M", "03/04/1985", "Torino")
+    with pytest.raises(codicefiscale.DecodeError) as error:
+        codicefiscale.encode(*args)
+    assert error.value.reason == codicefiscale.ErrorReason.BIRTHPLACE_DATE
+    assert codicefiscale.encode(*args, verify=False) == "CCCFBA85D03L219P"
+
+
+def test_encode_parts(encode_test_cases):
+    """Test encoding from already normalized components."""
+    for case in encode_test_cases:
+        record = case["input"]
+        code = case["result"]
+        assert (
+            codicefiscale.encode_parts(
+                lastname=record["lastname"],
+                firstname=record["firstname"],
+                gender=record["gender"],
+                birthdate=codicefiscale._get_date(record["birthdate"]).date(),
+                birthplace_code=codicefiscale.encode_birthplace(record["birthplace"]),
+            )
+            == code
+        )
+    assert (
+        codicefiscale.encode_parts(
+            lastname_code="CCC",
+            firstname_code="FBA",
+            gender="M",
+            birthdate=date(1985, 4, 3),
+            birthplace_code="L219",
+        )
+        == "CCCFBA85D03L219P"
+    )
+
+
+def test_encode_parts_invalid_arguments():
+    """Test invalid arguments for encoding from components."""
+    kwargs = {
+        "lastname": "Caccamo",
+        "firstname": "Fabio",
+        "gender": "M",
+        "birthdate": date(1985, 4, 3),
+        "birthplace_code": "L219",
+    }
+    assert codicefiscale.encode_parts(**kwargs) == "CCCFBA85D03L219P"
+    invalid_kwargs = [
+        {"lastname": None},
+        {"lastname_code": "cc"},
+        {"firstname_code": "FBA\n"},
+        {"gender": "X"},
+        {"birthdate": "03/04/1985"},
+        {"birthplace_code": "Torino"},
+        # birthplace code not existing / not active at birthdate
+        {"birthplace_code": "Z999"},
+        {"birthplace_code": "A003", "birthdate": date(2000, 1, 1)},
+    ]
+    for invalid in invalid_kwargs:
+        with pytest.raises(ValueError):
+            codicefiscale.encode_parts(**{**kwargs, **invalid})
@@ -0,0 +1,98 @@
+import re
+import subprocess
+import sys
+
+import pytest
+
+# generous budget, the import of the package alone takes a few milliseconds
+IMPORT_TIME_BUDGET_USEC: int = 100_000
+
+HEAVY_MODULES: tuple[str, ...] = (
+    "codicefiscale.codicefiscale",
+    "dateutil",
+    "fsutil",
+    "slugify",
+)
+
+
+def _run_python(code: str, *options: str) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(
+        [sys.executable, *options, "-c", code],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+
+
+def _get_loaded_modules(code: str) -> set[str]:
+    result = _run_python(f"{code}\nimport sys\nprint(' '.join(sys.modules))")
+    return set(result.stdout.split())
+
+
+def test_import_package_is_lazy():
+    """
+    Test that importing the package doesn't import the api and heavy dependencies.
+    """
+    modules = _get_loaded_modules("import codicefiscale")
+    assert modules.isdisjoint(HEAVY_MODULES)
+
+
+def test_import_package_api_attribute():
+    """
+    Test that the package api is imported on first attribute access.
+    """
+    modules = _get_loaded_modules(
+        "import codicefiscale\n"
+        "assert codicefiscale.is_valid('CCCFBA85D03L219P', level='syntax')"
+    )
+    assert "codicefiscale.codicefiscale" in modules
+    assert modules.isdisjoint(HEAVY_MODULES[1:])
+
+
+def test_import_package_submodule_attribute():
+    """
+    Test that the package submodules are imported on first attribute access.
+    """
+    modules = _get_loaded_modules(
+        "import codicefiscale\n"
+        "assert codicefiscale.codicefiscale.decode('CCCFBA85D03L219P')\n"
+        "assert codicefiscale.data.BIRTHPLACE_CODES_COUNT"
+    )
+    assert "codicefiscale.codicefiscale" in modules
+    assert "codicefiscale.data" in modules
+
+
+def test_import_package_unknown_attribute():
+    """
+    Test that accessing an unknown package attribute raises AttributeError.
+    """
+    import codicefiscale
+
+    with pytest.raises(AttributeError):
+        _ = codicefiscale.unknown_attribute
+
+
+@pytest.mark.parametrize(
+    "level",
+    ["syntax", "checksum"],
+)
+def test_is_valid_without_heavy_dependencies(level):
+    """
+    Test that syntax and checksum validation don't import heavy dependencies.
+    """
+    modules = _get_loaded_modules(
+        "from codicefiscale import codicefiscale\n"
+        f"assert codicefiscale.is_valid('CCCFBA85D03L219P', level={level!r})"
+    )
+    assert modules.isdisjoint(HEAVY_MODULES[1:])
+
+
+def test_import_time_budget():
+    """
+    Test that importing the package stays within the import time budget.
+    """
+    result = _run_python("import codicefiscale", "-X", "importtime")
+    # import time: self [us] | cumulative | imported package
+    match = re.search(r"\|\s*(\d+)\s*\|\s*codicefiscale\s*$", result.stderr, re.M)
+    assert match is not None
+    assert int(match.group(1)) < IMPORT_TIME_BUDGET_USEC
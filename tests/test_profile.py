@@ -0,0 +1,199 @@
+from datetime import date
+
+import pytest
+
+from codicefiscale import codicefiscale, data
+
+
+@pytest.fixture
+def data_profile(monkeypatch):
+    monkeypatch.delenv(data.DATA_PROFILE_ENV, raising=False)
+    yield codicefiscale.set_data_profile
+    codicefiscale.set_data_profile("full")
+
+
+def test_parse_data_profile():
+    """
+    Test the parsing of the data profile names.
+    """
+    assert data.parse_data_profile("full") == data.DataProfile()
+    assert data.parse_data_profile(" Since:1950 ") == data.DataProfile(
+        name="since:1950", since=date(1950, 1, 1)
+    )
+    assert data.parse_data_profile("codes-only").codes_only is True
+    assert data.parse_data_profile("since:1950").id == "since-1950"
+    for name in ["", "since:", "since:abc", "since:0", "minimal"]:
+        with pytest.raises(ValueError):
+            data.parse_data_profile(name)
+
+
+def test_data_profile_default(data_profile):
+    """
+    Test that the full data profile is used by default.
+    """
+    data_profile(None)
+    assert codicefiscale.get_data_profile() == "full"
+
+
+def test_data_profile_from_env(data_profile, monkeypatch):
+    """
+    Test that the data profile can be selected using the environment variable.
+    """
+    monkeypatch.setenv(data.DATA_PROFILE_ENV, "since:2000")
+    data_profile(None)
+    assert codicefiscale.get_data_profile() == "since:2000"
+
+
+def test_data_profile_invalid(data_profile):
+    """
+    Test that an invalid data profile raises ValueError.
+    """
+    with pytest.raises(ValueError):
+        data_profile("since:the-beginning")
+    assert codicefiscale.get_data_profile() == "full"
+
+
+def test_data_profile_since_decode(data_profile):
+    """
+    Test that codes with birthdate before the profile year are out of profile.
+    """
+    data_profile("since:1990")
+    assert codicefiscale.decode("CCCFBA95D03L219R")["birthplace"]["code"] == "L219"
+    with pytest.raises(codicefiscale.DecodeError) as error:
+        codicefiscale.decode("CCCFBA85D03L219P")
+    assert error.value.reason == codicefiscale.ErrorReason.OUT_OF_PROFILE
+    assert "out of data profile 'since:1990'" in str(error.value)
+    assert codicefiscale.is_valid("CCCFBA85D03L219P") is False
+    assert (
+        codicefiscale.get_error_reason("CCCFBA85D03L219P")
+        == codicefiscale.ErrorReason.OUT_OF_PROFILE
+    )
+    # the syntax / checksum / date checks don't depend on the profile
+    assert codicefiscale.is_valid("CCCFBA85D03L219P", level="date")
+
+
+def test_data_profile_since_decode_century(data_profile):
+    """
+    Test that codes resolved only in the previous century are out of profile.
+    """
+    fiscal_code = "RSSMRA20A01A003U"
+    reference_date = date(2026, 1, 1)
+    decoded = codicefiscale.decode(fiscal_code, reference_date=reference_date)
+    assert decoded["birthdate"].year == 1920
+    data_profile("since:1950")
+    with pytest.raises(codicefiscale.DecodeError) as error:
+        codicefiscale.decode(fiscal_code, reference_date=reference_date)
+    assert error.value.reason == codicefiscale.ErrorReason.OUT_OF_PROFILE
+    assert "out of data profile 'since:1950': 1920/1/1" in str(error.value)
+    assert (
+        codicefiscale.get_error_reason(fiscal_code, reference_date=reference_date)
+        == codicefiscale.ErrorReason.OUT_OF_PROFILE
+    )
+
+
+def test_data_profile_since_decode_unknown_birthplace(data_profile):
+    """
+    Test that codes with unknown birthplace codes are not out of profile.
+    """
+    data_profile("since:1950")
+    for fiscal_code in ["FRTMXM74L15D354A", "CCCFBA74L15Z999C"]:
+        with pytest.raises(codicefiscale.DecodeError) as error:
+            codicefiscale.decode(fiscal_code)
+        assert error.value.reason == codicefiscale.ErrorReason.BIRTHPLACE
+        assert "wrong birthplace code" in str(error.value)
+        assert (
+            codicefiscale.get_error_reason(fiscal_code)
+            == codicefiscale.ErrorReason.BIRTHPLACE
+        )
+
+
+def test_data_profile_since_encode(data_profile):
+    """
+    Test that encoding a birthdate before the profile year raises ValueError.
+    """
+    data_profile("since:1990")
+    assert (
+        codicefiscale.encode("Caccamo", "Fabio", "M", "03/04/1995", "Torino")
+        == "CCCFBA95D03L219R"
+    )
+    with pytest.raises(ValueError, match="out of data profile"):
+        codicefiscale.encode("Caccamo", "Fabio", "M", "03/04/1985", "Torino")
+    with pytest.raises(ValueError, match="out of data profile"):
+        codicefiscale.encode_parts(
+            lastname="Caccamo",
+            firstname="Fabio",
+            gender="M",
+            birthdate=date(1985, 4, 3),
+            birthplace_code="L219",
+        )
+
+
+def test_data_profile_since_deleted_birthplace(data_profile):
+    """
+    Test that birthplaces deleted before the profile year are not loaded.
+    """
+    data_profile("since:1950")
+    # Abbadia Alpina (A003) has been deleted in 1928
+    with pytest.raises(ValueError, match="not mapped to code"):
+        codicefiscale.encode_birthplace("Abbadia Alpina")
+    assert codicefiscale.encode_birthplace("Torino") == "L219"
+    # the code exists, but it is not valid at the birthdate
+    # (1900/2/29 is not a valid date, 2000/2/29 is the only candidate)
+    assert (
+        codicefiscale.get_error_reason(
+            "CCCFBA00B69A003B", reference_date=date(2026, 1, 1)
+        )
+        == codicefiscale.ErrorReason.BIRTHPLACE_DATE
+    )
+    # the code could be valid at the birthdate in the previous century
+    assert (
+        codicefiscale.get_error_reason(
+            "CCCFBA20D03A003S", reference_date=date(2026, 1, 1)
+        )
+        == codicefiscale.ErrorReason.OUT_OF_PROFILE
+    )
+
+
+def test_data_profile_codes_only(data_profile):
+    """
+    Test that birthplaces can be encoded only by code in the codes-only profile.
+    """
+    data_profile("codes-only")
+    decoded = codicefiscale.decode("CCCFBA85D03L219P")
+    assert decoded["birthplace"]["name"] == "Torino"
+    assert decoded["birthplace"]["province"] == "TO"
+    assert "name_trans" not in decoded["birthplace"]
+    assert decoded["firstname_options"]
+    assert codicefiscale.encode_birthplace("L219") == "L219"
+    with pytest.raises(ValueError, match="not available in data profile"):
+        codicefiscale.encode_birthplace("Torino")
+
+
+def test_data_profile_clears_caches(data_profile):
+    """
+    Test that changing the data profile clears the data and the caches.
+    """
+    codicefiscale.set_cache_maxsize(10)
+    try:
+        codicefiscale.decode("CCCFBA85D03L219P")
+        codicefiscale.encode_birthplace("Torino")
+        assert codicefiscale.cache_info().currsize == 1
+        data_profile("since:1990")
+        assert codicefiscale.cache_info().currsize == 0
+        assert len(codicefiscale._BIRTHPLACES_CACHE) == 0
+        assert codicefiscale._DATA is None
+        assert not codicefiscale.is_valid("CCCFBA85D03L219P")
+    finally:
+        codicefiscale.set_cache_maxsize(0)
+
+
+def test_data_profile_cache_filepath():
+    """
+    Test that the snapshots of different data profiles are kept separately.
+    """
+    profile = data.parse_data_profile("since:1950")
+    cache_filepath = data.get_indexed_data_cache_filepath("codes", profile)
+    if cache_filepath is None:
+        pytest.skip("indexed data snapshots are disabled")
+    assert cache_filepath.endswith(".since-1950.codes.pickle")
+    assert cache_filepath != data.get_indexed_data_cache_filepath("codes")
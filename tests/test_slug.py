@@ -0,0 +1,48 @@
+import pytest
+from slugify import slugify
+
+from codicefiscale import slug
+from codicefiscale.data import get_countries_data, get_municipalities_data
+
+
+@pytest.fixture
+def slug_test_cases():
+    # latin chars in different positions, separators and quotes
+    chars = [chr(code) for code in range(0x0180)] + ["‘", "’"]
+    contexts = ["{char}", "a{char}b", "a {char} b", "{char}{char}a", "1{char}2"]
+    return [context.format(char=char) for char in chars for context in contexts]
+
+
+def test_get_slug(slug_test_cases):
+    """
+    Test that the slug is the same returned by slugify.
+    """
+    for text in slug_test_cases:
+        assert slug.get_slug(text) == slugify(text)
+        assert slug.get_slug(text, allow_unicode=True) == slugify(
+            text, allow_unicode=True
+        )
+
+
+def test_get_slug_birthplaces():
+    """
+    Test that all the birthplaces names are slugified without slugify.
+    """
+    names = [item["name"] for item in get_municipalities_data()]
+    names += [item["name"] for item in get_countries_data()]
+    for name in names:
+        assert slug._SLUG_ASCII_CHARS.issuperset(name)
+        assert slug._SLUG_UNICODE_CHARS.issuperset(name)
+        assert slug.get_slug(name) == slugify(name)
+        assert slug.get_slug(name, allow_unicode=True) == slugify(
+            name, allow_unicode=True
+        )
+
+
+def test_get_letters(slug_test_cases):
+    """
+    Test that the letters are the same of the slugify slug.
+    """
+    for text in slug_test_cases + ["D'Angelo", "Niccolò", "Müller", "Ægir &amp;"]:
+        letters = "".join(char for char in slugify(text) if char.isalpha())
+        assert slug.get_letters(text) == letters
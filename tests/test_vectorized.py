@@ -0,0 +1,115 @@
+import random
+import string
+
+import pytest
+
+from codicefiscale import codicefiscale
+
+np = pytest.importorskip("numpy")
+vectorized = pytest.importorskip("codicefiscale.vectorized")
+
+
+def _get_reason(code):
+    try:
+        raw = codicefiscale.decode_raw(code)
+    except ValueError:
+        return codicefiscale.ErrorReason.SYNTAX
+    if raw["code"] != code.upper():
+        # normalized by decode_raw, not supported by the vectorized validation
+        return codicefiscale.ErrorReason.SYNTAX
+    if codicefiscale.encode_cin(raw["code"]) != raw["cin"]:
+        return codicefiscale.ErrorReason.CIN
+    return 0
+
+
+@pytest.fixture
+def codes_test_cases():
+    codes = [
+        "CCCFBA85D03L219P",
+        "cccfba85d03l219p",
+        "CCCFBA85D03L21VE",
+        "CCCFBAURDLPLNMVU",
+        "CCCFBA85D03L219B",  # wrong CIN
+        "CC0FBA85D03L219P",  # invalid lastname
+        "CCCFBA85X03L219P",  # invalid date-month
+        "CCCFBA85D031219P",  # invalid birthplace
+        "CCCFBA85D03L219",  # too short
+        "CCC FBA85D03L219",  # space
+    ]
+    chars = string.ascii_uppercase + string.digits
+    rnd = random.Random(16)
+    for _ in range(500):
+        code = list(rnd.choice(codes[:4]))
+        code[rnd.randrange(16)] = rnd.choice(chars)
+        codes.append("".join(code))
+    return codes
+
+
+def test_validate(codes_test_cases):
+    """
+    Test that the vectorized validation matches the syntax and CIN checks.
+    """
+    codes = np.array(codes_test_cases, dtype="S16")
+    valid, reasons = vectorized.validate(codes)
+    assert valid.dtype == np.bool_
+    assert reasons.dtype == np.uint8
+    expected_reasons = [_get_reason(code) for code in codes_test_cases]
+    assert reasons.tolist() == expected_reasons
+    assert valid.tolist() == [reason == 0 for reason in expected_reasons]
+    assert valid[:4].all()
+    assert not valid[4:10].any()
+    assert 0 < valid.sum() < len(codes_test_cases)
+
+
+def test_validate_buffer():
+    """
+    Test the vectorized validation of a buffer of 16-byte records.
+    """
+    buffer = b"CCCFBA85D03L219PCCCFBA85D03L219BCC0FBA85D03L219P"
+    valid, reasons = vectorized.validate(buffer)
+    assert valid.tolist() == [True, False, False]
+    assert reasons.tolist() == [
+        0,
+        codicefiscale.ErrorReason.CIN,
+        codicefiscale.ErrorReason.SYNTAX,
+    ]
+    valid, reasons = vectorized.validate(memoryview(bytearray(buffer)))
+    assert valid.tolist() == [True, False, False]
+    valid, reasons = vectorized.validate(b"")
+    assert valid.tolist() == []
+
+
+def test_validate_non_ascii_records():
+    """
+    Test that records with non-ascii bytes are invalid syntax, as in `is_valid`.
+    """
+    records = [
+        b"CCCFBA85D03L219P",
+        b"AAAURA75B69\xe9M18R",
+        b"CCCFBA85D03L219\xd0",
+        b"\xc7CCFBA85D03L219P",
+        b"CCCFBA85D03L21\xb29",
+    ]
+    valid, reasons = vectorized.validate(np.array(records, dtype="S16"))
+    assert valid.tolist() == [
+        codicefiscale.is_valid(record, level="checksum") for record in records
+    ]
+    assert valid.tolist() == [True, False, False, False, False]
+    assert reasons[1:].tolist() == [codicefiscale.ErrorReason.SYNTAX] * 4
+    for record in records[1:]:
+        assert (
+            codicefiscale.get_error_reason(record, level="checksum")
+            == codicefiscale.ErrorReason.SYNTAX
+        )
+
+
+def test_validate_with_invalid_input():
+    """
+    Test the vectorized validation with invalid input.
+    """
+    with pytest.raises(ValueError):
+        vectorized.validate(b"CCCFBA85D03L219")
+    with pytest.raises(ValueError):
+        vectorized.validate(np.array(["CCCFBA85D03L219P"]))
+    with pytest.raises(ValueError):
+        vectorized.validate(np.array([b"CCCFBA85D03L219P"], dtype="S17"))